@@ -2,7 +2,7 @@
 Dashboard Agent - Visualization specialist
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 from app.agents.state import AgentState
 from app.agents.tools.dashboard_tools import (
@@ -52,9 +52,13 @@ class DashboardAgent:
                     "dashboard_config": None
                 }
             
+            # Column-major view of the data, filled on demand and shared by
+            # the analysis and every chart; dropped with this request
+            column_cache: Dict[str, List[Any]] = {}
+            
             # Step 1: Analyze data structure
             print("🔍 Analyzing data structure...")
-            data_analysis = await analyze_data_structure(data)
+            data_analysis = await analyze_data_structure(data, column_cache)
             
             # Step 2: Select visualization types
             print("📊 Selecting visualizations...")
@@ -74,7 +78,8 @@ class DashboardAgent:
                     config = await generate_chart_config(
                         data=data,
                         chart_type=chart_type,
-                        data_analysis=data_analysis
+                        data_analysis=data_analysis,
+                        column_cache=column_cache
                     )
                     if config:
                         chart_configs.append(config)
@@ -16,6 +16,22 @@ from app.services.redis_service import redis_service
 from app.config import settings
 
 
+# Dispatch tables (one dict lookup instead of if/elif chains)
+
+NEXT_AGENT_BY_INTENT = {
+    "general": "supervisor",
+    "sql": "sql",
+    "dashboard": "dashboard",
+    "sql_and_dashboard": "sql",
+}
+
+ROUTE_BY_NEXT_AGENT = {
+    "sql": "sql",
+    "dashboard": "dashboard",
+    "end": "end",
+}
+
+
 # Node functions for LangGraph
 
 
@@ -33,14 +49,9 @@ async def supervisor_classify_node(state: AgentState, db: Session) -> AgentState
         state["intent"] = intent
 
         # Set next agent based on intent
-        if intent == "general":
-            state["next_agent"] = "supervisor"
-        elif intent == "sql":
-            state["next_agent"] = "sql"
-        elif intent == "dashboard":
-            state["next_agent"] = "dashboard"
-        elif intent == "sql_and_dashboard":
-            state["next_agent"] = "sql"
+        next_agent = NEXT_AGENT_BY_INTENT.get(intent)
+        if next_agent:
+            state["next_agent"] = next_agent
 
         return state
 
@@ -223,14 +234,8 @@ def route_next(
             return "aggregate"
         else:
             return "supervisor_respond"
-    elif next_agent == "sql":
-        return "sql"
-    elif next_agent == "dashboard":
-        return "dashboard"
-    elif next_agent == "end":
-        return "end"
-    else:
-        return "end"
+
+    return ROUTE_BY_NEXT_AGENT.get(next_agent, "end")
 
 
 # Graph creation
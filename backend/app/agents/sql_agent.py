@@ -210,7 +210,8 @@ understand what the user is actually asking for."""
                     try:
                         obs_data = json.loads(observation)
                         if obs_data.get("success"):
-                            sql_data = obs_data.get("rows", [])
+                            columns = obs_data.get("columns", [])
+                            sql_data = [dict(zip(columns, row)) for row in obs_data.get("rows", [])]
                             row_count = obs_data.get("row_count", 0)
                             execution_time_ms = obs_data.get("execution_time_ms", 0)
                             print(f"✅ [AGENT] Query successful: {row_count} rows in {execution_time_ms}ms")
@@ -1,18 +1,57 @@
 """
 SQL Agent Tools - LangChain tools for SQL operations
 """
-from langchain.tools import tool
 from langchain_core.tools import Tool
 from sqlalchemy import text
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List
 import json
 import time
 import re
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from app.models.db_connection import DBConnection
 from app.services.db_service import db_connection_manager
 
 
+def _json_default(value: Any) -> Any:
+    """
+    Serialize values JSON has no native type for.
+    
+    Args:
+        value: Cell value from the database driver
+        
+    Returns:
+        Any: JSON-serializable value
+    """
+    if hasattr(value, 'isoformat'):  # datetime, date
+        return value.isoformat()
+    if isinstance(value, bytes):
+        return value.decode('utf-8', errors='ignore')
+    return str(value)  # Decimal, UUID, ...
+
+
+def _dumps(payload: Dict[str, Any]) -> str:
+    """
+    Serialize a tool result to JSON, using orjson when it is installed.
+    
+    Args:
+        payload: Tool result
+        
+    Returns:
+        str: JSON string
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload, default=_json_default).decode()
+        except orjson.JSONEncodeError:
+            pass  # e.g. integers wider than 64 bits
+    return json.dumps(payload, default=_json_default)
+
+
 class SQLTools:
     """Collection of tools for SQL agent"""
     
@@ -29,6 +68,7 @@ class SQLTools:
         """
         Execute SQL query against the connected database.
         Returns results in JSON format or error message.
+        Rows are value lists in the order given by "columns".
         
         Args:
             sql_query: SQL query to execute
@@ -44,42 +84,36 @@ class SQLTools:
             if not self._is_safe_sql(sql_query):
                 error_msg = "Query validation failed: Only SELECT queries are allowed"
                 print(f"❌ [SQL_TOOL] {error_msg}")
-                return json.dumps({
+                return _dumps({
                     "success": False,
                     "error": error_msg,
                     "rows": []
                 })
             
-            # Get database session
-            session = db_connection_manager.get_session(self.db_config, read_only=True)
-            
-            # Execute query with timeout
-            start_time = time.time()
-            result = session.execute(text(sql_query))
-            execution_time = int((time.time() - start_time) * 1000)
-            
-            # Fetch results
-            rows = []
-            if result.returns_rows:
-                columns = list(result.keys())
-                for row in result:
-                    row_dict = {}
-                    for i, col in enumerate(columns):
-                        value = row[i]
-                        # Convert non-serializable types
-                        if hasattr(value, 'isoformat'):  # datetime, date
-                            value = value.isoformat()
-                        elif isinstance(value, bytes):
-                            value = value.decode('utf-8', errors='ignore')
-                        row_dict[col] = value
-                    rows.append(row_dict)
+            # Check a connection out of the engine's pool (no ORM session needed);
+            # it is returned to the pool even if the query fails
+            engine = db_connection_manager.get_engine(self.db_config, read_only=True)
             
-            session.close()
+            with engine.connect() as connection:
+                # Execute query with timeout
+                start_time = time.time()
+                result = connection.execute(text(sql_query))
+                execution_time = int((time.time() - start_time) * 1000)
+                
+                # Fetch results column-oriented: names once, then one value list
+                # per row, instead of repeating every column name in every row
+                columns = []
+                rows = []
+                if result.returns_rows:
+                    columns = list(result.keys())
+                    # Non-JSON-native cells are converted during serialization
+                    rows = [list(row) for row in result]
             
             print(f"✅ [SQL_TOOL] Query executed successfully: {len(rows)} rows returned in {execution_time}ms")
             
-            return json.dumps({
+            return _dumps({
                 "success": True,
+                "columns": columns,
                 "rows": rows,
                 "row_count": len(rows),
                 "execution_time_ms": execution_time,
@@ -90,7 +124,7 @@ class SQLTools:
             error_msg = str(e)
             print(f"❌ [SQL_TOOL] Query execution failed: {error_msg}")
             
-            return json.dumps({
+            return _dumps({
                 "success": False,
                 "error": error_msg,
                 "rows": [],
@@ -146,7 +180,8 @@ class SQLTools:
                 description=(
                     "Execute a SQL SELECT query against the database. "
                     "Input should be a valid SQL SELECT query. "
-                    "Returns JSON with success status, rows of data, and row count. "
+                    "Returns JSON with success status, column names, rows of data "
+                    "(one list of values per row, in column order), and row count. "
                     "Use this tool to retrieve data from the database."
                 ),
                 func=self.execute_sql_query
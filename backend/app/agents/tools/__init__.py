@@ -21,6 +21,7 @@ from app.agents.tools.dashboard_tools import (
     analyze_data_structure,
     select_visualization,
     create_dashboard_html,
+    iter_dashboard_html,
     add_interactivity,
     generate_chart_config
 )
@@ -41,6 +42,7 @@ __all__ = [
     "analyze_data_structure",
     "select_visualization",
     "create_dashboard_html",
+    "iter_dashboard_html",
     "add_interactivity",
     "generate_chart_config"
 ]
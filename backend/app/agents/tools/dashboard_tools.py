@@ -2,9 +2,22 @@
 Dashboard Agent Tools
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Tuple
+from collections import OrderedDict
+import copy
+import hashlib
 import json
-from jinja2 import Template
+import math
+import re
+from itertools import islice
+from operator import itemgetter
+from jinja2 import Environment
+from markupsafe import escape
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from app.services.claude_service import claude_service
 from app.agents.prompts.dashboard_prompts import (
@@ -14,14 +27,29 @@ from app.agents.prompts.dashboard_prompts import (
 from app.config import settings
 
 
+# Column names that suggest a date/time string
+_TIME_COLUMN_RE = re.compile(r'date|time|created|updated', re.IGNORECASE)
+
+# JSON payloads in Claude responses (fenced block first, then bare object)
+_JSON_BLOCK_RE = re.compile(r'```json\n(.*?)\n```', re.DOTALL)
+_JSON_OBJECT_RE = re.compile(r'\{.*\}', re.DOTALL)
+
+# LRU cache of data analyses keyed by _data_fingerprint() (a hash of all rows)
+_ANALYSIS_CACHE_SIZE = 128
+_analysis_cache: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+
+
 async def analyze_data_structure(
-    data: List[Dict[str, Any]]
+    data: List[Dict[str, Any]],
+    column_cache: Optional[Dict[str, List[Any]]] = None
 ) -> Dict[str, Any]:
     """
     Analyze data structure and characteristics.
     
     Args:
         data: Query results data
+        column_cache: Column-major view of data shared with generate_chart_config
+            (filled on demand; see _column_values)
     
     Returns:
         Analysis dictionary with dimensions, metrics, data types, etc.
@@ -37,6 +65,13 @@ async def analyze_data_structure(
                 "time_column": None
             }
         
+        # Serve repeated analyses of the same result set from cache
+        fingerprint = _data_fingerprint(data)
+        cached_analysis = _analysis_cache.get(fingerprint)
+        if cached_analysis is not None:
+            _analysis_cache.move_to_end(fingerprint)
+            return copy.deepcopy(cached_analysis)
+        
         # Get first few rows for analysis
         sample_size = min(5, len(data))
         data_sample = json.dumps(data[:sample_size], indent=2, default=str)
@@ -46,15 +81,17 @@ async def analyze_data_structure(
         column_info = {}
         
         for col in columns:
-            # Infer type from first non-null value
-            sample_values = [row[col] for row in data[:10] if row.get(col) is not None]
-            if sample_values:
-                first_value = sample_values[0]
+            # Infer type from first non-null value in the first 10 rows
+            first_value = next(
+                (row[col] for row in islice(data, 10) if row.get(col) is not None),
+                None
+            )
+            if first_value is not None:
                 if isinstance(first_value, (int, float)):
                     column_info[col] = "number"
                 elif isinstance(first_value, str):
                     # Check if it's a date string
-                    if any(date_indicator in col.lower() for date_indicator in ['date', 'time', 'created', 'updated']):
+                    if _TIME_COLUMN_RE.search(col):
                         column_info[col] = "datetime"
                     else:
                         column_info[col] = "string"
@@ -77,13 +114,19 @@ async def analyze_data_structure(
         # Extract JSON from response
         analysis = _extract_json_from_response(content)
         
-        # Add actual cardinality
+        # Add actual cardinality.
+        # Columns extracted here are reused by generate_chart_config when the
+        # caller passes the same column_cache.
         for col in columns:
-            unique_values = len(set(str(row.get(col)) for row in data))
+            unique_values = _estimate_cardinality(_column_values(data, col, column_cache))
             if "cardinality" not in analysis:
                 analysis["cardinality"] = {}
             analysis["cardinality"][col] = unique_values
         
+        _analysis_cache[fingerprint] = copy.deepcopy(analysis)
+        if len(_analysis_cache) > _ANALYSIS_CACHE_SIZE:
+            _analysis_cache.popitem(last=False)
+        
         return analysis
         
     except Exception as e:
@@ -137,6 +180,11 @@ async def select_visualization(
         # Ensure required fields
         if "chart_types" not in visualization_selection:
             visualization_selection["chart_types"] = ["bar"]
+        else:
+            # Drop duplicate suggestions, keeping Claude's order
+            visualization_selection["chart_types"] = list(
+                dict.fromkeys(visualization_selection["chart_types"])
+            )
         if "primary_chart" not in visualization_selection:
             visualization_selection["primary_chart"] = visualization_selection["chart_types"][0]
         
@@ -155,7 +203,8 @@ async def select_visualization(
 async def generate_chart_config(
     data: List[Dict[str, Any]],
     chart_type: str,
-    data_analysis: Dict[str, Any]
+    data_analysis: Dict[str, Any],
+    column_cache: Optional[Dict[str, List[Any]]] = None
 ) -> Dict[str, Any]:
     """
     Generate Chart.js configuration for a specific chart type.
@@ -164,6 +213,7 @@ async def generate_chart_config(
         data: Query results data
         chart_type: Type of chart (bar, line, pie, scatter, table)
         data_analysis: Data structure analysis
+        column_cache: Column-major view of data shared across charts
     
     Returns:
         Chart.js configuration dictionary
@@ -173,17 +223,25 @@ async def generate_chart_config(
         metrics = data_analysis.get("metrics", [])
         
         # Use first dimension and metric for simplicity
-        x_column = dimensions[0] if dimensions else list(data[0].keys())[0]
-        y_column = metrics[0] if metrics else list(data[0].keys())[1] if len(data[0].keys()) > 1 else list(data[0].keys())[0]
+        if dimensions and metrics:
+            x_column, y_column = dimensions[0], metrics[0]
+        else:
+            columns = list(data[0])
+            x_column = dimensions[0] if dimensions else columns[0]
+            y_column = metrics[0] if metrics else columns[1] if len(columns) > 1 else columns[0]
         
-        # Extract labels and values
-        labels = [str(row.get(x_column, '')) for row in data]
-        values = [float(row.get(y_column, 0)) if row.get(y_column) is not None else 0 for row in data]
+        # Column-major values, shared by every chart built from this data
+        x_values = _column_values(data, x_column, column_cache)
+        y_values = _column_values(data, y_column, column_cache)
         
         # Limit data points for pie charts
-        if chart_type == "pie" and len(labels) > 10:
-            labels = labels[:10]
-            values = values[:10]
+        if chart_type == "pie":
+            x_values = x_values[:10]
+            y_values = y_values[:10]
+        
+        # Extract labels and values
+        labels = list(map(str, x_values))
+        values = [float(value) if value is not None else 0 for value in y_values]
         
         # Chart.js configuration
         config = {
@@ -264,33 +322,49 @@ async def create_dashboard_html(
         Complete HTML string
     """
     try:
-        template = Template(DASHBOARD_HTML_TEMPLATE)
-        
-        # Prepare chart sections
-        chart_sections = []
-        for idx, config in enumerate(chart_configs):
-            chart_sections.append({
-                "id": f"chart{idx}",
-                "config": json.dumps(config)
-            })
-        
-        # Render table data
-        table_html = _generate_table_html(data)
-        
-        html = template.render(
-            title=title,
-            chart_sections=chart_sections,
-            table_html=table_html,
-            data_json=json.dumps(data, default=str)
-        )
-        
-        return html
+        return "".join(iter_dashboard_html(data, chart_configs, title))
         
     except Exception as e:
         print(f"❌ Error creating dashboard HTML: {e}")
         return "<html><body><h1>Error generating dashboard</h1></body></html>"
 
 
+def iter_dashboard_html(
+    data: List[Dict[str, Any]],
+    chart_configs: List[Dict[str, Any]],
+    title: str = "Data Dashboard"
+) -> Iterator[str]:
+    """
+    Render the dashboard HTML as a stream of chunks.
+    
+    Suitable for a StreamingResponse; create_dashboard_html joins it.
+    
+    Args:
+        data: Query results data
+        chart_configs: List of Chart.js configurations
+        title: Dashboard title
+    
+    Yields:
+        HTML chunks in document order
+    """
+    # Prepare chart sections (configs are serialized by the template's tojson filter)
+    chart_sections = []
+    for idx, config in enumerate(chart_configs):
+        chart_sections.append({
+            "id": f"chart{idx}",
+            "config": config
+        })
+    
+    # Render table data
+    table_html = _generate_table_html(data)
+    
+    yield from _DASHBOARD_TEMPLATE.generate(
+        title=title,
+        chart_sections=chart_sections,
+        table_html=table_html
+    )
+
+
 async def add_interactivity(
     html: str,
     data: List[Dict[str, Any]],
@@ -322,17 +396,71 @@ async def add_interactivity(
         return html
 
 
+def _to_json(obj: Any) -> str:
+    """Serialize to compact JSON, using orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=str).decode()
+        except orjson.JSONEncodeError:
+            pass  # e.g. integers wider than 64 bits
+    return json.dumps(obj, default=str, separators=(',', ':'))
+
+
+def _data_fingerprint(data: List[Dict[str, Any]]) -> Tuple:
+    """
+    Build a fingerprint of a result set for caching.
+    
+    Hashes every row, so result sets that differ anywhere get different
+    fingerprints. Serializing the rows is still far cheaper than the
+    Claude call the analysis cache saves.
+    """
+    digest = hashlib.blake2b(_to_json(data).encode(), digest_size=16).digest()
+    return len(data), digest
+
+
+def _column_values(
+    data: List[Dict[str, Any]],
+    column: str,
+    column_cache: Optional[Dict[str, List[Any]]] = None
+) -> List[Any]:
+    """
+    Get one column of a result set as a list.
+    
+    With a column_cache (a dict owned by the caller for the lifetime of one
+    dashboard), each column is extracted at most once and shared by the
+    analysis and every chart. Rows missing the column yield None.
+    
+    Args:
+        data: Query results data
+        column: Column name
+        column_cache: Column name -> values for this data, filled on demand
+    
+    Returns:
+        Column values in row order
+    """
+    if column_cache is not None and column in column_cache:
+        return column_cache[column]
+    
+    try:
+        values = list(map(itemgetter(column), data))
+    except KeyError:
+        values = [row.get(column) for row in data]
+    
+    if column_cache is not None:
+        column_cache[column] = values
+    return values
+
+
 def _extract_json_from_response(content: str) -> Dict[str, Any]:
     """Extract JSON object from Claude response."""
     try:
         # Try to find JSON in code blocks
-        import re
-        json_match = re.search(r'```json\n(.*?)\n```', content, re.DOTALL)
+        json_match = _JSON_BLOCK_RE.search(content)
         if json_match:
             return json.loads(json_match.group(1))
         
         # Try to find JSON without code blocks
-        json_match = re.search(r'\{.*\}', content, re.DOTALL)
+        json_match = _JSON_OBJECT_RE.search(content)
         if json_match:
             return json.loads(json_match.group(0))
         
@@ -342,46 +470,134 @@ def _extract_json_from_response(content: str) -> Dict[str, Any]:
         return {}
 
 
+# Distinct values are counted exactly up to this bound, then estimated
+_EXACT_CARDINALITY_LIMIT = 200
+
+# HyperLogLog precision (2^14 registers, ~0.8% standard error)
+_HLL_PRECISION = 14
+_HLL_REGISTERS = 1 << _HLL_PRECISION
+_HLL_HASH_MASK = (1 << 64) - 1
+_HLL_WORD_BITS = 64 - _HLL_PRECISION
+_HLL_INVERSE_POWERS = [2.0 ** -rank for rank in range(_HLL_WORD_BITS + 2)]
+
+
+class _HyperLogLog:
+    """Minimal HyperLogLog sketch for approximate distinct counts."""
+    
+    def __init__(self):
+        self.registers = bytearray(_HLL_REGISTERS)
+    
+    def add(self, value: str) -> None:
+        """Add a value to the sketch."""
+        hashed = hash(value) & _HLL_HASH_MASK
+        index = hashed >> _HLL_WORD_BITS
+        word = hashed & ((1 << _HLL_WORD_BITS) - 1)
+        rank = _HLL_WORD_BITS - word.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+    
+    def count(self) -> int:
+        """Estimate the number of distinct values added."""
+        m = _HLL_REGISTERS
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(map(_HLL_INVERSE_POWERS.__getitem__, self.registers))
+        
+        # Small-range correction (linear counting)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        
+        return int(round(estimate))
+
+
+def _estimate_cardinality(values: Iterable[Any]) -> int:
+    """
+    Count distinct values in a column.
+    
+    Exact up to _EXACT_CARDINALITY_LIMIT values, after which a HyperLogLog
+    sketch takes over so memory stays constant for high-cardinality columns.
+    
+    Args:
+        values: Column values
+    
+    Returns:
+        Exact or estimated number of distinct values
+    """
+    unique_values = set()
+    sketch = None
+    
+    for value in values:
+        key = str(value)
+        if sketch is not None:
+            sketch.add(key)
+            continue
+        
+        unique_values.add(key)
+        if len(unique_values) >= _EXACT_CARDINALITY_LIMIT:
+            sketch = _HyperLogLog()
+            for seen in unique_values:
+                sketch.add(seen)
+    
+    return len(unique_values) if sketch is None else sketch.count()
+
+
+CHART_COLORS = (
+    'rgba(54, 162, 235, 0.7)',   # Blue
+    'rgba(255, 99, 132, 0.7)',   # Red
+    'rgba(75, 192, 192, 0.7)',   # Green
+    'rgba(255, 206, 86, 0.7)',   # Yellow
+    'rgba(153, 102, 255, 0.7)',  # Purple
+    'rgba(255, 159, 64, 0.7)',   # Orange
+    'rgba(199, 199, 199, 0.7)',  # Gray
+    'rgba(83, 102, 255, 0.7)',   # Indigo
+    'rgba(255, 99, 255, 0.7)',   # Pink
+    'rgba(99, 255, 132, 0.7)'    # Light Green
+)
+
+BORDER_COLORS = (
+    'rgba(54, 162, 235, 1)',
+    'rgba(255, 99, 132, 1)',
+    'rgba(75, 192, 192, 1)',
+    'rgba(255, 206, 86, 1)',
+    'rgba(153, 102, 255, 1)',
+    'rgba(255, 159, 64, 1)',
+    'rgba(199, 199, 199, 1)',
+    'rgba(83, 102, 255, 1)',
+    'rgba(255, 99, 255, 1)',
+    'rgba(99, 255, 132, 1)'
+)
+
+
 def _get_chart_colors(count: int, chart_type: str) -> List[str]:
     """Get color array for charts."""
-    colors = [
-        'rgba(54, 162, 235, 0.7)',   # Blue
-        'rgba(255, 99, 132, 0.7)',   # Red
-        'rgba(75, 192, 192, 0.7)',   # Green
-        'rgba(255, 206, 86, 0.7)',   # Yellow
-        'rgba(153, 102, 255, 0.7)',  # Purple
-        'rgba(255, 159, 64, 0.7)',   # Orange
-        'rgba(199, 199, 199, 0.7)',  # Gray
-        'rgba(83, 102, 255, 0.7)',   # Indigo
-        'rgba(255, 99, 255, 0.7)',   # Pink
-        'rgba(99, 255, 132, 0.7)'    # Light Green
-    ]
-    
     if chart_type == "pie":
-        return colors[:count]
+        return list(CHART_COLORS[:count])
     else:
-        return colors[0]
+        return CHART_COLORS[0]
 
 
 def _get_border_colors(count: int, chart_type: str) -> List[str]:
     """Get border color array for charts."""
-    colors = [
-        'rgba(54, 162, 235, 1)',
-        'rgba(255, 99, 132, 1)',
-        'rgba(75, 192, 192, 1)',
-        'rgba(255, 206, 86, 1)',
-        'rgba(153, 102, 255, 1)',
-        'rgba(255, 159, 64, 1)',
-        'rgba(199, 199, 199, 1)',
-        'rgba(83, 102, 255, 1)',
-        'rgba(255, 99, 255, 1)',
-        'rgba(99, 255, 132, 1)'
-    ]
-    
     if chart_type == "pie":
-        return colors[:count]
+        return list(BORDER_COLORS[:count])
     else:
-        return colors[0]
+        return BORDER_COLORS[0]
+
+
+def _escape_cell(value: Any, escaped_strings: Dict[str, str]) -> str:
+    """
+    HTML-escape a table cell value.
+    
+    String values are memoized in escaped_strings so low-cardinality
+    columns pay the escaping cost once per distinct value.
+    """
+    if type(value) is not str:
+        return str(escape(value))
+    
+    escaped = escaped_strings.get(value)
+    if escaped is None:
+        escaped = escaped_strings[value] = str(escape(value))
+    return escaped
 
 
 def _generate_table_html(data: List[Dict[str, Any]], max_rows: int = 100) -> str:
@@ -392,20 +608,30 @@ def _generate_table_html(data: List[Dict[str, Any]], max_rows: int = 100) -> str
     columns = list(data[0].keys())
     rows = data[:max_rows]
     
+    header_cells = ''.join(f'<th>{escape(col)}</th>' for col in columns)
+    
     html = ['<div class="table-container">']
     html.append('<table class="data-table">')
-    html.append('<thead><tr>')
-    for col in columns:
-        html.append(f'<th>{col}</th>')
-    html.append('</tr></thead>')
+    html.append(f'<thead><tr>{header_cells}</tr></thead>')
     html.append('<tbody>')
     
+    # Fetch a whole row tuple at once; itemgetter returns a scalar for one column
+    get_cells = itemgetter(*columns)
+    single_column = len(columns) == 1
+    
+    # Repeated strings (status, region, ...) are escaped once per table
+    escaped_strings = {}
+    
+    # One joined string per row keeps the buffer at one entry per row
     for row in rows:
-        html.append('<tr>')
-        for col in columns:
-            value = row.get(col, '')
-            html.append(f'<td>{value}</td>')
-        html.append('</tr>')
+        try:
+            cells = get_cells(row)
+            if single_column:
+                cells = (cells,)
+        except KeyError:
+            cells = [row.get(col, '') for col in columns]
+        row_cells = ''.join(f'<td>{_escape_cell(value, escaped_strings)}</td>' for value in cells)
+        html.append(f'<tr>{row_cells}</tr>')
     
     html.append('</tbody></table>')
     
@@ -537,12 +763,18 @@ DASHBOARD_HTML_TEMPLATE = """<!DOCTYPE html>
         // Initialize charts
         {% for chart in chart_sections %}
         const ctx{{ loop.index }} = document.getElementById('{{ chart.id }}').getContext('2d');
-        const chart{{ loop.index }} = new Chart(ctx{{ loop.index }}, {{ chart.config | safe }});
+        const chart{{ loop.index }} = new Chart(ctx{{ loop.index }}, {{ chart.config | tojson }});
         {% endfor %}
     </script>
 </body>
 </html>
 """
 
+# Compiled once at import. Autoescaping covers the title; tojson escapes
+# <, >, & and ' so chart data cannot close the <script> block.
+_TEMPLATE_ENV = Environment(autoescape=True)
+_TEMPLATE_ENV.policies["json.dumps_function"] = _to_json
+_TEMPLATE_ENV.policies["json.dumps_kwargs"] = {}
+_DASHBOARD_TEMPLATE = _TEMPLATE_ENV.from_string(DASHBOARD_HTML_TEMPLATE)
 
 
@@ -2,25 +2,33 @@
 SQL Agent Tools
 """
 
-from typing import List, Dict, Any, Optional
+from typing import Dict, Any, Tuple
+from functools import lru_cache
+from itertools import islice
 from sqlalchemy import create_engine, text, inspect
 from sqlalchemy.orm import Session
 from uuid import UUID
-import json
 import re
 import time
 
 from app.services.redis_service import redis_service
+from app.services.db_service import db_connection_manager
 from app.services.claude_service import claude_service
 from app.models.db_connection import DBConnection
 from app.config import settings
 from app.agents.prompts.sql_prompts import (
     SQL_GENERATION_PROMPT,
-    SQL_VALIDATION_PROMPT,
     SQL_FIX_PROMPT
 )
 
 
+# Cell types that can be returned as-is (checked with an exact type lookup)
+_JSON_SAFE_TYPES = frozenset({str, int, float, bool, type(None)})
+
+# Rows fetched per round trip when streaming query results
+_STREAM_BATCH_SIZE = 1000
+
+
 async def get_database_schema(
     db_connection_id: UUID,
     db: Session
@@ -155,38 +163,12 @@ async def validate_query(
         Validation result dictionary
     """
     try:
-        issues = []
-        suggestions = []
-        
-        # Check for dangerous SQL keywords
-        dangerous_keywords = [
-            r'\bDROP\b', r'\bDELETE\b', r'\bINSERT\b', r'\bUPDATE\b',
-            r'\bALTER\b', r'\bTRUNCATE\b', r'\bCREATE\b', r'\bEXEC\b',
-            r'\bEXECUTE\b', r'\b--\b', r'/\*', r'\*/', r'\bxp_\w+\b'
-        ]
-        
-        for keyword_pattern in dangerous_keywords:
-            if re.search(keyword_pattern, query, re.IGNORECASE):
-                issues.append(f"Query contains potentially dangerous operation: {keyword_pattern}")
-        
-        # Check if it's a SELECT query
-        if not re.match(r'^\s*SELECT\b', query, re.IGNORECASE):
-            issues.append("Query must be a SELECT statement (read-only)")
-        
-        # Check for LIMIT clause
-        if not re.search(r'\bLIMIT\s+\d+', query, re.IGNORECASE):
-            suggestions.append("Consider adding a LIMIT clause to prevent large result sets")
-        
-        # Basic syntax check
-        if query.count('(') != query.count(')'):
-            issues.append("Unbalanced parentheses in query")
-        
-        is_valid = len(issues) == 0
+        issues, suggestions = _check_query(query)
         
         return {
-            "is_valid": is_valid,
-            "issues": issues,
-            "suggestions": suggestions
+            "is_valid": not issues,
+            "issues": list(issues),
+            "suggestions": list(suggestions)
         }
         
     except Exception as e:
@@ -198,6 +180,49 @@ async def validate_query(
         }
 
 
+@lru_cache(maxsize=1024)
+def _check_query(query: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """
+    Run the static validation checks for a SQL query.
+    
+    The checks depend only on the query text, so results are memoized;
+    re-validating the same query (e.g. on retries) is a cache hit.
+    
+    Args:
+        query: SQL query to validate
+    
+    Returns:
+        Tuple of (issues, suggestions)
+    """
+    issues = []
+    suggestions = []
+    
+    # Check for dangerous SQL keywords
+    dangerous_keywords = [
+        r'\bDROP\b', r'\bDELETE\b', r'\bINSERT\b', r'\bUPDATE\b',
+        r'\bALTER\b', r'\bTRUNCATE\b', r'\bCREATE\b', r'\bEXEC\b',
+        r'\bEXECUTE\b', r'\b--\b', r'/\*', r'\*/', r'\bxp_\w+\b'
+    ]
+    
+    for keyword_pattern in dangerous_keywords:
+        if re.search(keyword_pattern, query, re.IGNORECASE):
+            issues.append(f"Query contains potentially dangerous operation: {keyword_pattern}")
+    
+    # Check if it's a SELECT query
+    if not re.match(r'^\s*SELECT\b', query, re.IGNORECASE):
+        issues.append("Query must be a SELECT statement (read-only)")
+    
+    # Check for LIMIT clause
+    if not re.search(r'\bLIMIT\s+\d+', query, re.IGNORECASE):
+        suggestions.append("Consider adding a LIMIT clause to prevent large result sets")
+    
+    # Basic syntax check
+    if query.count('(') != query.count(')'):
+        issues.append("Unbalanced parentheses in query")
+    
+    return tuple(issues), tuple(suggestions)
+
+
 async def execute_query(
     query: str,
     db_connection_id: UUID,
@@ -227,39 +252,28 @@ async def execute_query(
         if not db_conn:
             raise ValueError(f"Database connection {db_connection_id} not found")
         
-        # Get decrypted connection string
-        connection_string = db_conn.get_connection_string()
+        # Reuse the connection's cached, pooled read-only engine
+        engine = db_connection_manager.get_engine(db_conn, read_only=True)
         
-        # Create engine
-        engine = create_engine(
-            connection_string,
-            pool_pre_ping=True,
-            pool_recycle=3600
-        )
-        
-        # Execute query
+        # Execute query with a server-side cursor (where supported) so rows
+        # beyond the row limit are never fetched from the database
         with engine.connect() as connection:
-            result = connection.execute(text(query))
+            result = connection.execute(
+                text(query).execution_options(yield_per=_STREAM_BATCH_SIZE)
+            )
             
             # Fetch results
             columns = list(result.keys())
-            rows = []
-            
-            for row in result:
-                row_dict = {}
-                for i, value in enumerate(row):
-                    # Convert non-serializable types
-                    if hasattr(value, 'isoformat'):  # datetime objects
-                        row_dict[columns[i]] = value.isoformat()
-                    else:
-                        row_dict[columns[i]] = value
-                rows.append(row_dict)
-                
-                # Respect row limit
-                if len(rows) >= settings.SQL_ROW_LIMIT:
-                    break
-        
-        engine.dispose()
+            # Respect row limit; only non-JSON-native cells need converting
+            rows = [
+                {
+                    column: value if type(value) in _JSON_SAFE_TYPES else _convert_value(value)
+                    for column, value in zip(columns, row)
+                }
+                for row in islice(result, settings.SQL_ROW_LIMIT)
+            ]
+            has_more = result.fetchone() is not None
+            result.close()
         
         execution_time = time.time() - start_time
         
@@ -270,6 +284,7 @@ async def execute_query(
                 "column_count": len(columns),
                 "columns": columns,
                 "execution_time": round(execution_time, 3),
+                "has_more": has_more,
                 "query": query
             }
         }
@@ -323,6 +338,22 @@ async def fix_query(
         raise
 
 
+def _convert_value(value: Any) -> Any:
+    """
+    Convert a non-JSON-native cell value for query results.
+    
+    Args:
+        value: Cell value from the database driver
+    
+    Returns:
+        Converted value
+    """
+    # Convert non-serializable types
+    if hasattr(value, 'isoformat'):  # datetime objects
+        return value.isoformat()
+    return value
+
+
 def _format_schema_for_prompt(schema: Dict[str, Any]) -> str:
     """
     Format database schema for inclusion in prompts.
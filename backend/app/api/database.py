@@ -1,7 +1,7 @@
 """
 Database Connection Management API Endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
 from uuid import UUID
@@ -18,6 +18,7 @@ from app.schemas.database import (
 )
 from app.services.db_service import db_connection_manager
 from app.services.schema_service import schema_service
+from app.services.redis_service import redis_service
 
 router = APIRouter()
 
@@ -25,14 +26,19 @@ router = APIRouter()
 @router.post("", response_model=DBConnectionResponse, status_code=status.HTTP_201_CREATED)
 def create_database_connection(
     connection_data: DBConnectionCreate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Add a new database connection.
     
+    The connection's schema is loaded into the cache in the background,
+    so the first query does not pay for schema extraction.
+    
     Args:
         connection_data: Database connection details
+        background_tasks: Tasks run after the response is sent
         db: Database session
         current_user: Current authenticated user
         
@@ -59,6 +65,8 @@ def create_database_connection(
     db.commit()
     db.refresh(new_connection)
     
+    background_tasks.add_task(schema_service.warm_schema_cache, new_connection)
+    
     return new_connection
 
 
@@ -176,6 +184,12 @@ def update_database_connection(
     db.commit()
     db.refresh(connection)
     
+    # Connection details may now point at a different database: drop the
+    # cached schema and the engines built from the old details
+    redis_service.invalidate_schema(connection.id)
+    db_connection_manager.close_connection(connection.id, read_only=True)
+    db_connection_manager.close_connection(connection.id, read_only=False)
+    
     return connection
 
 
@@ -213,6 +227,10 @@ def delete_database_connection(
     db.delete(connection)
     db.commit()
     
+    redis_service.invalidate_schema(connection_id, forget=True)
+    db_connection_manager.close_connection(connection_id, read_only=True)
+    db_connection_manager.close_connection(connection_id, read_only=False)
+    
     return {"message": "Database connection deleted successfully"}
 
 
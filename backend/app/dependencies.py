@@ -4,12 +4,11 @@ Shared Dependencies for FastAPI Endpoints
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
-from jose import JWTError, jwt
 from typing import Optional
 
 from app.database import get_db
-from app.config import settings
 from app.models.user import User
+from app.utils.security import decode_token
 
 # Security scheme for JWT bearer token
 security = HTTPBearer()
@@ -38,17 +37,13 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    try:
-        token = credentials.credentials
-        payload = jwt.decode(
-            token,
-            settings.JWT_SECRET_KEY,
-            algorithms=[settings.JWT_ALGORITHM]
-        )
-        user_id: Optional[str] = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-    except JWTError:
+    # Verified payloads are cached briefly, so repeat requests skip signature checks
+    payload = decode_token(credentials.credentials)
+    if payload is None:
+        raise credentials_exception
+    
+    user_id: Optional[str] = payload.get("sub")
+    if user_id is None:
         raise credentials_exception
     
     user = db.query(User).filter(User.id == user_id).first()
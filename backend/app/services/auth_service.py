@@ -9,7 +9,7 @@ from typing import Optional, Tuple
 from app.models.user import User, RefreshToken
 from app.schemas.user import UserCreate
 from app.schemas.auth import Token
-from app.utils.security import hash_password, verify_password, create_access_token, create_refresh_token, decode_token
+from app.utils.security import hash_password, verify_password, create_access_token, create_refresh_token, decode_token, forget_token
 from app.config import settings
 
 
@@ -199,6 +199,7 @@ class AuthService:
         token_obj.revoked = True
         token_obj.revoked_at = datetime.utcnow()
         db.commit()
+        forget_token(refresh_token)
         
         return True
 
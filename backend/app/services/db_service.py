@@ -6,7 +6,7 @@ from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import OperationalError, SQLAlchemyError
 from cryptography.fernet import Fernet
-from typing import Dict, Optional
+from typing import Dict
 import time
 from datetime import datetime
 
@@ -3,7 +3,10 @@ Redis Service - Simplified in-memory version (no Redis required)
 """
 
 import json
-from typing import Optional, Dict, Any, List
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime
 from uuid import UUID
 
@@ -14,10 +17,27 @@ class RedisService:
     State is stored in memory and cleared on restart.
     """
 
+    # Maximum number of cached schemas (least recently used are evicted)
+    SCHEMA_CACHE_MAX_ENTRIES = 512
+
+    # Adaptive schema caching: a connection whose schema is invalidated more
+    # often than once per SCHEMA_CACHE_MIN_READS_PER_INVALIDATION lookups is
+    # not worth caching (it mostly serves stale or soon-dropped entries).
+    SCHEMA_CACHE_MIN_READS_PER_INVALIDATION = 5
+    # Lookups observed before a connection can be excluded from caching
+    SCHEMA_CACHE_MIN_LOOKUPS = 20
+    # Counters are halved once lookups reach this, so old behaviour fades
+    SCHEMA_STATS_WINDOW = 1000
+
     def __init__(self):
         """Initialize in-memory storage"""
         self.state_store: Dict[str, Any] = {}
-        self.schema_cache: Dict[UUID, Any] = {}  # Changed from int to UUID
+        # db_connection_id -> (expires_at, schema), in LRU order
+        self.schema_cache: "OrderedDict[UUID, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        # db_connection_id -> {"hits", "misses", "invalidations"}
+        self.schema_stats: Dict[UUID, Dict[str, int]] = {}
+        # Sync endpoints run in a threadpool, so guard the schema cache
+        self._schema_lock = threading.Lock()
         self.conversations: Dict[str, List[Dict]] = {}
         print("✅ In-memory state service initialized (no Redis required)")
 
@@ -91,13 +111,20 @@ class RedisService:
         Args:
             db_connection_id: Database connection ID (UUID)
             schema: Schema dictionary
-            ttl_minutes: Ignored (no TTL in memory)
+            ttl_minutes: Minutes until the cached schema expires
 
         Returns:
             bool: Success status
         """
         try:
-            self.schema_cache[db_connection_id] = schema
+            expires_at = time.monotonic() + ttl_minutes * 60
+            with self._schema_lock:
+                if not self._schema_caching_enabled(db_connection_id):
+                    return True
+                self.schema_cache[db_connection_id] = (expires_at, schema)
+                self.schema_cache.move_to_end(db_connection_id)
+                while len(self.schema_cache) > self.SCHEMA_CACHE_MAX_ENTRIES:
+                    self.schema_cache.popitem(last=False)
             return True
         except Exception as e:
             print(f"❌ Error caching schema: {e}")
@@ -114,14 +141,117 @@ class RedisService:
             db_connection_id: Database connection ID
 
         Returns:
-            Optional[Dict]: Schema dictionary or None if not found
+            Optional[Dict]: Schema dictionary or None if not found or expired
         """
         try:
-            return self.schema_cache.get(db_connection_id)
+            with self._schema_lock:
+                entry = self.schema_cache.get(db_connection_id)
+                if entry is not None and entry[0] <= time.monotonic():
+                    del self.schema_cache[db_connection_id]
+                    entry = None
+                self._record_schema_event(
+                    db_connection_id,
+                    "misses" if entry is None else "hits"
+                )
+                if entry is None:
+                    return None
+                self.schema_cache.move_to_end(db_connection_id)
+                return entry[1]
         except Exception as e:
             print(f"❌ Error retrieving cached schema: {e}")
             return None
 
+    def has_cached_schema(self, db_connection_id: UUID) -> bool:
+        """
+        Check for an unexpired cached schema without counting a hit or miss.
+
+        Args:
+            db_connection_id: Database connection ID
+
+        Returns:
+            bool: True if a cached schema is available
+        """
+        with self._schema_lock:
+            entry = self.schema_cache.get(db_connection_id)
+            return entry is not None and entry[0] > time.monotonic()
+
+    def invalidate_schema(self, db_connection_id: UUID, forget: bool = False) -> bool:
+        """
+        Drop a cached schema so the next lookup reloads it.
+
+        Call this whenever a connection is changed or removed.
+
+        Args:
+            db_connection_id: Database connection ID
+            forget: Also drop the connection's cache statistics (on delete)
+
+        Returns:
+            bool: True if a cached schema was removed
+        """
+        with self._schema_lock:
+            if forget:
+                self.schema_stats.pop(db_connection_id, None)
+            else:
+                self._record_schema_event(db_connection_id, "invalidations")
+            return self.schema_cache.pop(db_connection_id, None) is not None
+
+    def get_schema_cache_stats(self, db_connection_id: UUID) -> Dict[str, Any]:
+        """
+        Get schema cache statistics for a connection.
+
+        Args:
+            db_connection_id: Database connection ID
+
+        Returns:
+            Dict: Hit/miss/invalidation counters and whether caching is enabled
+        """
+        with self._schema_lock:
+            stats = dict(self.schema_stats.get(
+                db_connection_id,
+                {"hits": 0, "misses": 0, "invalidations": 0}
+            ))
+            stats["enabled"] = self._schema_caching_enabled(db_connection_id)
+            return stats
+
+    def _record_schema_event(self, db_connection_id: UUID, event: str) -> None:
+        """
+        Count a schema cache event (caller holds the schema lock).
+
+        Args:
+            db_connection_id: Database connection ID
+            event: "hits", "misses" or "invalidations"
+        """
+        stats = self.schema_stats.setdefault(
+            db_connection_id,
+            {"hits": 0, "misses": 0, "invalidations": 0}
+        )
+        stats[event] += 1
+
+        # Decay all counters so the decision tracks recent behaviour
+        if stats["hits"] + stats["misses"] >= self.SCHEMA_STATS_WINDOW:
+            for key in stats:
+                stats[key] //= 2
+
+    def _schema_caching_enabled(self, db_connection_id: UUID) -> bool:
+        """
+        Decide whether caching pays off for a connection (caller holds the lock).
+
+        Args:
+            db_connection_id: Database connection ID
+
+        Returns:
+            bool: True if the schema should be cached
+        """
+        stats = self.schema_stats.get(db_connection_id)
+        if stats is None or not stats["invalidations"]:
+            return True
+
+        lookups = stats["hits"] + stats["misses"]
+        if lookups < self.SCHEMA_CACHE_MIN_LOOKUPS:
+            return True
+
+        return lookups / stats["invalidations"] >= self.SCHEMA_CACHE_MIN_READS_PER_INVALIDATION
+
     async def add_conversation_message(
         self,
         session_id: str,
@@ -1,9 +1,9 @@
 """
 Schema Service - Extract and cache database schemas
 """
-from sqlalchemy import create_engine, inspect, text
+from sqlalchemy import inspect
 from typing import Dict, Any, List, Optional
-from uuid import UUID
+import asyncio
 import traceback
 
 from app.models.db_connection import DBConnection
@@ -14,6 +14,11 @@ from app.services.redis_service import redis_service
 class SchemaService:
     """Service for extracting and caching database schemas"""
     
+    # Maximum schema warm-ups running at once (avoids a thundering herd)
+    MAX_CONCURRENT_WARMUPS = 4
+    _warmup_semaphore = asyncio.Semaphore(MAX_CONCURRENT_WARMUPS)
+    _warmups_in_flight = set()
+    
     @staticmethod
     def extract_schema(db_config: DBConnection) -> Dict[str, Any]:
         """
@@ -28,7 +33,8 @@ class SchemaService:
         print(f"📊 [SCHEMA] Extracting schema for database: {db_config.database_name}")
         
         try:
-            # Get database engine
+            # Fresh inspector per extraction: extraction only runs on a schema
+            # cache miss, when reflection results must not be stale
             engine = db_connection_manager.get_engine(db_config, read_only=True)
             inspector = inspect(engine)
             
@@ -42,14 +48,13 @@ class SchemaService:
             table_names = inspector.get_table_names(schema=db_config.schema)
             print(f"📊 [SCHEMA] Found {len(table_names)} tables")
             
-            # Extract detailed information for each table
-            for table_name in table_names:
-                table_info = SchemaService._extract_table_info(
-                    inspector, 
-                    table_name, 
+            # Bulk reflection: one query per metadata kind for all tables
+            if table_names:
+                schema_info["tables"] = SchemaService._extract_tables_bulk(
+                    inspector,
+                    table_names,
                     db_config.schema
                 )
-                schema_info["tables"].append(table_info)
             
             print(f"✅ [SCHEMA] Schema extraction complete: {len(schema_info['tables'])} tables processed")
             return schema_info
@@ -60,19 +65,54 @@ class SchemaService:
             raise
     
     @staticmethod
-    def _extract_table_info(
-        inspector, 
-        table_name: str, 
+    def _extract_tables_bulk(
+        inspector,
+        table_names: List[str],
         schema: Optional[str]
-    ) -> Dict[str, Any]:
+    ) -> List[Dict[str, Any]]:
         """
-        Extract detailed information for a single table.
+        Extract information for all tables using bulk reflection.
         
         Args:
             inspector: SQLAlchemy inspector
-            table_name: Name of the table
+            table_names: Names of the tables, in output order
             schema: Schema name (optional)
             
+        Returns:
+            List[Dict]: Table information for each table
+        """
+        columns_by_table = inspector.get_multi_columns(schema=schema, filter_names=table_names)
+        pks_by_table = inspector.get_multi_pk_constraint(schema=schema, filter_names=table_names)
+        fks_by_table = inspector.get_multi_foreign_keys(schema=schema, filter_names=table_names)
+        
+        tables = []
+        for table_name in table_names:
+            # Bulk results are keyed by (schema, table_name)
+            key = (schema, table_name)
+            tables.append(SchemaService._build_table_info(
+                table_name,
+                columns_by_table.get(key, []),
+                pks_by_table.get(key),
+                fks_by_table.get(key, [])
+            ))
+        return tables
+    
+    @staticmethod
+    def _build_table_info(
+        table_name: str,
+        columns: List[Dict[str, Any]],
+        pk_constraint: Optional[Dict[str, Any]],
+        foreign_keys: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Build table information from reflected metadata.
+        
+        Args:
+            table_name: Name of the table
+            columns: Reflected columns
+            pk_constraint: Reflected primary key constraint
+            foreign_keys: Reflected foreign keys
+            
         Returns:
             Dict: Table information
         """
@@ -83,8 +123,6 @@ class SchemaService:
             "foreign_keys": []
         }
         
-        # Get columns
-        columns = inspector.get_columns(table_name, schema=schema)
         for column in columns:
             table_info["columns"].append({
                 "name": column["name"],
@@ -93,13 +131,9 @@ class SchemaService:
                 "default": str(column.get("default", "")) if column.get("default") else None
             })
         
-        # Get primary keys
-        pk_constraint = inspector.get_pk_constraint(table_name, schema=schema)
         if pk_constraint and pk_constraint.get("constrained_columns"):
             table_info["primary_keys"] = pk_constraint["constrained_columns"]
         
-        # Get foreign keys
-        foreign_keys = inspector.get_foreign_keys(table_name, schema=schema)
         for fk in foreign_keys:
             table_info["foreign_keys"].append({
                 "columns": fk.get("constrained_columns", []),
@@ -140,6 +174,36 @@ class SchemaService:
         
         return schema
     
+    @staticmethod
+    async def warm_schema_cache(db_config: DBConnection) -> None:
+        """
+        Load a connection's schema into the cache ahead of its first query.
+        
+        Intended to run as a background task; errors are logged, not raised.
+        
+        Args:
+            db_config: Database connection configuration
+        """
+        if db_config.id in SchemaService._warmups_in_flight:
+            return
+        
+        SchemaService._warmups_in_flight.add(db_config.id)
+        try:
+            async with SchemaService._warmup_semaphore:
+                # Peek only: warm-ups must not skew the cache hit/miss stats
+                if redis_service.has_cached_schema(db_config.id):
+                    return
+                
+                print(f"🔥 [SCHEMA] Warming schema cache for DB: {db_config.id}")
+                # Reflection is blocking; keep it off the event loop
+                loop = asyncio.get_running_loop()
+                schema = await loop.run_in_executor(None, SchemaService.extract_schema, db_config)
+                await redis_service.cache_schema(db_config.id, schema, ttl_minutes=60)
+        except Exception as e:
+            print(f"⚠️  [SCHEMA] Schema warm-up failed for DB {db_config.id}: {str(e)}")
+        finally:
+            SchemaService._warmups_in_flight.discard(db_config.id)
+    
     @staticmethod
     def format_schema_for_agent(schema: Dict[str, Any]) -> str:
         """
@@ -2,9 +2,14 @@
 Security Utilities - Password Hashing and JWT Helpers
 """
 from passlib.context import CryptContext
-from jose import jwt, JWTError
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from jose import jwk, jwt, JWTError
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Optional, Dict, Any, Tuple
+import hashlib
+import hmac
+import threading
+import time
 
 from app.config import settings
 
@@ -14,6 +19,24 @@ pwd_context = CryptContext(
     deprecated="auto"
 )
 
+# Short-lived cache of successful verifications (failures are never cached).
+# Keys are HMACs of (hash, password), so no plaintext is stored and a
+# password change produces a new hash that can never hit an old entry.
+_VERIFY_CACHE_SIZE = 4096
+_VERIFY_CACHE_TTL_SECONDS = 30
+_verify_cache: "OrderedDict[bytes, float]" = OrderedDict()
+_verify_cache_lock = threading.Lock()
+
+# Signing key constructed once instead of on every token issued
+_SIGNING_KEY = jwk.construct(settings.JWT_SECRET_KEY, settings.JWT_ALGORITHM)
+
+# Short-lived cache of verified token payloads, keyed by a token digest.
+# Entries never outlive the token's own "exp" claim.
+_DECODE_CACHE_SIZE = 8192
+_DECODE_CACHE_TTL_SECONDS = 30
+_decode_cache: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_decode_cache_lock = threading.Lock()
+
 
 def hash_password(password: str) -> str:
     """
@@ -32,6 +55,7 @@ def hash_password(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify a password against its hash.
+    Successful verifications are cached for a few seconds.
     
     Args:
         plain_password: Plain text password
@@ -40,40 +64,75 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         bool: True if password matches, False otherwise
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    cache_key = hmac.new(
+        settings.JWT_SECRET_KEY.encode(),
+        hashed_password.encode() + b"\0" + plain_password.encode(),
+        hashlib.sha256
+    ).digest()
+    now = time.monotonic()
+    
+    with _verify_cache_lock:
+        expires_at = _verify_cache.get(cache_key)
+        if expires_at is not None:
+            if expires_at > now:
+                return True
+            del _verify_cache[cache_key]
+    
+    if not pwd_context.verify(plain_password, hashed_password):
+        return False
+    
+    with _verify_cache_lock:
+        _verify_cache[cache_key] = now + _VERIFY_CACHE_TTL_SECONDS
+        while len(_verify_cache) > _VERIFY_CACHE_SIZE:
+            _verify_cache.popitem(last=False)
+    
+    return True
 
 
-def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
+def _make_token(data: Dict[str, Any], expires_delta: timedelta, token_type: str) -> str:
     """
-    Create JWT access token.
+    Create a signed JWT of the given type.
     
     Args:
         data: Data to encode in token (typically user_id as 'sub')
-        expires_delta: Optional custom expiration time
+        expires_delta: Time until the token expires
+        token_type: Token type claim ("access" or "refresh")
         
     Returns:
         str: Encoded JWT token
     """
-    to_encode = data.copy()
-    
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    # Integer UNIX timestamps, as they are serialized in the token anyway
+    now = int(time.time())
+    to_encode = {
+        **data,
+        "exp": now + int(expires_delta.total_seconds()),
+        "iat": now,
+        "type": token_type
+    }
     
-    to_encode.update({
-        "exp": expire,
-        "iat": datetime.utcnow(),
-        "type": "access"
-    })
-    
-    encoded_jwt = jwt.encode(
+    return jwt.encode(
         to_encode,
-        settings.JWT_SECRET_KEY,
+        _SIGNING_KEY,
         algorithm=settings.JWT_ALGORITHM
     )
+
+
+def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
+    """
+    Create JWT access token.
     
-    return encoded_jwt
+    Args:
+        data: Data to encode in token (typically user_id as 'sub')
+        expires_delta: Optional custom expiration time
+        
+    Returns:
+        str: Encoded JWT token
+    """
+    return _make_token(
+        data,
+        expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+        "access"
+    )
 
 
 def create_refresh_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
@@ -87,31 +146,22 @@ def create_refresh_token(data: Dict[str, Any], expires_delta: Optional[timedelta
     Returns:
         str: Encoded JWT refresh token
     """
-    to_encode = data.copy()
-    
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-    
-    to_encode.update({
-        "exp": expire,
-        "iat": datetime.utcnow(),
-        "type": "refresh"
-    })
-    
-    encoded_jwt = jwt.encode(
-        to_encode,
-        settings.JWT_SECRET_KEY,
-        algorithm=settings.JWT_ALGORITHM
+    return _make_token(
+        data,
+        expires_delta or timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+        "refresh"
     )
-    
-    return encoded_jwt
+
+
+def _token_digest(token: str) -> bytes:
+    """Digest used as the decode cache key for a token."""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
 
 
 def decode_token(token: str) -> Optional[Dict[str, Any]]:
     """
     Decode and verify JWT token.
+    Verified payloads are cached for a few seconds.
     
     Args:
         token: JWT token string
@@ -119,14 +169,44 @@ def decode_token(token: str) -> Optional[Dict[str, Any]]:
     Returns:
         Optional[Dict]: Decoded token payload or None if invalid
     """
+    cache_key = _token_digest(token)
+    now = time.time()
+    
+    with _decode_cache_lock:
+        entry = _decode_cache.get(cache_key)
+        if entry is not None:
+            expires_at, payload = entry
+            if expires_at > now:
+                return dict(payload)
+            del _decode_cache[cache_key]
+    
     try:
         payload = jwt.decode(
             token,
             settings.JWT_SECRET_KEY,
             algorithms=[settings.JWT_ALGORITHM]
         )
-        return payload
     except JWTError:
         return None
+    
+    expires_at = now + _DECODE_CACHE_TTL_SECONDS
+    if isinstance(payload.get("exp"), (int, float)):
+        expires_at = min(expires_at, payload["exp"])
+    
+    with _decode_cache_lock:
+        _decode_cache[cache_key] = (expires_at, dict(payload))
+        while len(_decode_cache) > _DECODE_CACHE_SIZE:
+            _decode_cache.popitem(last=False)
+    
+    return payload
 
 
+def forget_token(token: str) -> None:
+    """
+    Drop a token from the decode cache (e.g. when it is revoked).
+    
+    Args:
+        token: JWT token string
+    """
+    with _decode_cache_lock:
+        _decode_cache.pop(_token_digest(token), None)
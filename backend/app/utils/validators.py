@@ -5,7 +5,26 @@ import sqlparse
 from sqlparse.sql import IdentifierList, Identifier, Where, Token
 from sqlparse.tokens import Keyword, DML
 import re
-from typing import List, Tuple, Optional
+from bisect import bisect_right
+from functools import lru_cache
+from typing import List, Tuple, Optional, Sequence, Union
+
+# Optional Rust-backed SQL parser (much faster than sqlparse)
+try:
+    from sqloxide import parse_sql as _sqloxide_parse
+except ImportError:
+    _sqloxide_parse = None
+
+
+@lru_cache(maxsize=512)
+def _format_sql(sql: str) -> str:
+    """Reformat SQL with sqlparse; memoized since formatting is pure and slow."""
+    return sqlparse.format(
+        sql,
+        reindent=True,
+        keyword_case='upper',
+        strip_comments=True
+    )
 
 
 class SQLValidator:
@@ -21,19 +40,66 @@ class SQLValidator:
     # Allowed DML operations (read-only)
     ALLOWED_DML = {"SELECT", "WITH"}
     
+    # All dangerous keywords as one word-boundary alternation (single scan).
+    # Case-insensitive, so the query never has to be upper-cased.
+    _DANGEROUS_RE = re.compile(
+        r'\b(' + '|'.join(sorted(DANGEROUS_KEYWORDS)) + r')\b',
+        re.IGNORECASE
+    )
+    
+    # Common SQL injection patterns, compiled once
+    _INJECTION_PATTERNS = tuple(
+        re.compile(pattern, re.IGNORECASE)
+        for pattern in (
+            r"'\s*OR\s+'1'\s*=\s*'1",
+            r"'\s*OR\s+1\s*=\s*1",
+            r"admin'\s*--",
+            r"'\s*;\s*DROP\s+TABLE",
+            r"'\s*;\s*DELETE\s+FROM",
+            r"EXEC\s*\(",
+            r"EXECUTE\s*\(",
+        )
+    )
+    
+    # Comment markers, or a ';' followed by anything other than trailing
+    # semicolons/whitespace (i.e. a stacked statement)
+    _SUSPICIOUS_RE = re.compile(r'--|/\*|\*/|;(?!;*\s*\Z)')
+    
+    # validate_many() scans many queries joined by this separator; the
+    # suspicious-marker scan then treats it as the end of each query
+    _BATCH_SEPARATOR = "\x00"
+    _BATCH_SUSPICIOUS_RE = re.compile(r'--|/\*|\*/|;(?!;*\s*(?:\x00|\Z))')
+    
+    _UNION_SELECT_RE = re.compile(r'\bUNION\s+(ALL\s+)?SELECT\b', re.IGNORECASE)
+    
     @staticmethod
-    def is_select_only(sql: str) -> bool:
+    def _parse(sql: Union[str, Sequence]) -> Sequence:
+        """
+        Parse SQL unless it has already been parsed.
+        
+        Args:
+            sql: SQL query string or statements from sqlparse.parse()
+            
+        Returns:
+            Sequence: Parsed statements
+        """
+        if isinstance(sql, str):
+            return sqlparse.parse(sql)
+        return sql
+    
+    @staticmethod
+    def is_select_only(sql: Union[str, Sequence]) -> bool:
         """
         Check if SQL query is SELECT-only (read-only).
         
         Args:
-            sql: SQL query string
+            sql: SQL query string or statements from sqlparse.parse()
             
         Returns:
             bool: True if query is SELECT-only, False otherwise
         """
         # Parse SQL
-        parsed = sqlparse.parse(sql)
+        parsed = SQLValidator._parse(sql)
         if not parsed:
             return False
         
@@ -72,29 +138,25 @@ class SQLValidator:
         Returns:
             Tuple[bool, List[str]]: (contains_dangerous, list_of_dangerous_keywords)
         """
-        sql_upper = sql.upper()
-        found_dangerous = []
-        
-        for keyword in SQLValidator.DANGEROUS_KEYWORDS:
-            # Use word boundaries to avoid false positives
-            pattern = r'\b' + keyword + r'\b'
-            if re.search(pattern, sql_upper):
-                found_dangerous.append(keyword)
+        # One pass over the query; keep each keyword once, in order of appearance
+        found_dangerous = list(dict.fromkeys(
+            keyword.upper() for keyword in SQLValidator._DANGEROUS_RE.findall(sql)
+        ))
         
         return len(found_dangerous) > 0, found_dangerous
     
     @staticmethod
-    def has_multiple_statements(sql: str) -> bool:
+    def has_multiple_statements(sql: Union[str, Sequence]) -> bool:
         """
         Check if SQL contains multiple statements (potential SQL injection).
         
         Args:
-            sql: SQL query string
+            sql: SQL query string or statements from sqlparse.parse()
             
         Returns:
             bool: True if multiple statements found, False otherwise
         """
-        parsed = sqlparse.parse(sql)
+        parsed = SQLValidator._parse(sql)
         return len([s for s in parsed if s.get_type() != 'UNKNOWN']) > 1
     
     @staticmethod
@@ -108,36 +170,46 @@ class SQLValidator:
         Returns:
             Tuple[bool, Optional[str]]: (is_suspicious, reason)
         """
-        sql_lower = sql.lower()
+        # Find comments and stacked statements in a single scan
+        markers = SQLValidator._SUSPICIOUS_RE.findall(sql)
         
+        # Check for UNION-based injection
+        if SQLValidator._UNION_SELECT_RE.search(sql):
+            # UNION SELECT is allowed for legitimate queries
+            # but we'll flag it for extra scrutiny
+            pass
+        
+        # First matching injection pattern (not needed once a marker is found)
+        injection = None if markers else next(
+            (pattern for pattern in SQLValidator._INJECTION_PATTERNS if pattern.search(sql)),
+            None
+        )
+        
+        return SQLValidator._injection_result(markers, injection)
+    
+    @staticmethod
+    def _injection_result(markers: Sequence[str], injection: Optional["re.Pattern"]) -> Tuple[bool, Optional[str]]:
+        """
+        Turn injection scan results into a (is_suspicious, reason) verdict.
+        
+        Args:
+            markers: Comment markers and stacked ';' found in the query
+            injection: First injection pattern that matched, if any
+            
+        Returns:
+            Tuple[bool, Optional[str]]: (is_suspicious, reason)
+        """
         # Check for comment-based injection
-        if "--" in sql or "/*" in sql or "*/" in sql:
+        if any(marker != ";" for marker in markers):
             return True, "SQL comments detected (potential injection)"
         
         # Check for semicolon (statement terminator)
-        if ";" in sql.strip().rstrip(";"):
+        if markers:
             return True, "Multiple statements detected (potential injection)"
         
-        # Check for UNION-based injection
-        if re.search(r'\bUNION\s+(ALL\s+)?SELECT\b', sql_lower):
-            # UNION SELECT is allowed for legitimate queries
-            # but we'll flag it for extra scrutiny
-            pass
-        
         # Check for common injection patterns
-        injection_patterns = [
-            r"'\s*OR\s+'1'\s*=\s*'1",
-            r"'\s*OR\s+1\s*=\s*1",
-            r"admin'\s*--",
-            r"'\s*;\s*DROP\s+TABLE",
-            r"'\s*;\s*DELETE\s+FROM",
-            r"EXEC\s*\(",
-            r"EXECUTE\s*\(",
-        ]
-        
-        for pattern in injection_patterns:
-            if re.search(pattern, sql, re.IGNORECASE):
-                return True, f"SQL injection pattern detected: {pattern}"
+        if injection is not None:
+            return True, f"SQL injection pattern detected: {injection.pattern}"
         
         return False, None
     
@@ -152,7 +224,7 @@ class SQLValidator:
         Returns:
             Tuple[bool, Optional[str]]: (is_valid, error_message)
         """
-        if not sql or not sql.strip():
+        if not sql or sql.isspace():
             return False, "Empty SQL query"
         
         # Check for SQL injection patterns
@@ -160,28 +232,136 @@ class SQLValidator:
         if is_suspicious:
             return False, reason
         
-        # Check for multiple statements
-        if SQLValidator.has_multiple_statements(sql):
-            return False, "Multiple SQL statements not allowed"
+        return SQLValidator._validate_structure(
+            sql, SQLValidator.contains_dangerous_keywords(sql)[1]
+        )
+    
+    @staticmethod
+    def validate_many(sqls: Sequence[str]) -> List[Tuple[bool, Optional[str]]]:
+        """
+        Validate many SQL queries at once.
+        
+        Runs each regex once over all queries joined into a single buffer
+        instead of once per query. Results match validate_sql() per query.
+        
+        Args:
+            sqls: SQL query strings
+            
+        Returns:
+            List[Tuple[bool, Optional[str]]]: (is_valid, error_message) per query
+        """
+        separator = SQLValidator._BATCH_SEPARATOR
+        results: List[Optional[Tuple[bool, Optional[str]]]] = [None] * len(sqls)
+        
+        # Empty queries and queries containing the separator go through validate_sql
+        batch = []
+        for index, sql in enumerate(sqls):
+            if not sql or sql.isspace() or separator in sql:
+                results[index] = SQLValidator.validate_sql(sql)
+            else:
+                batch.append(index)
+        
+        if not batch:
+            return results
+        
+        # Start offset of each query in the joined buffer
+        starts = []
+        offset = 0
+        for index in batch:
+            starts.append(offset)
+            offset += len(sqls[index]) + len(separator)
+        buffer = separator.join(sqls[index] for index in batch)
+        
+        markers: List[List[str]] = [[] for _ in batch]
+        for match in SQLValidator._BATCH_SUSPICIOUS_RE.finditer(buffer):
+            markers[bisect_right(starts, match.start()) - 1].append(match.group())
+        
+        # Earliest pattern wins, as in check_sql_injection_patterns()
+        injections: List[Optional["re.Pattern"]] = [None] * len(batch)
+        for pattern in SQLValidator._INJECTION_PATTERNS:
+            for match in pattern.finditer(buffer):
+                slot = bisect_right(starts, match.start()) - 1
+                if injections[slot] is None:
+                    injections[slot] = pattern
+        
+        dangerous: List[dict] = [{} for _ in batch]
+        for match in SQLValidator._DANGEROUS_RE.finditer(buffer):
+            dangerous[bisect_right(starts, match.start()) - 1][match.group().upper()] = None
+        
+        for slot, index in enumerate(batch):
+            is_suspicious, reason = SQLValidator._injection_result(markers[slot], injections[slot])
+            if is_suspicious:
+                results[index] = (False, reason)
+            else:
+                results[index] = SQLValidator._validate_structure(sqls[index], list(dangerous[slot]))
+        
+        return results
+    
+    @staticmethod
+    def _validate_structure(sql: str, dangerous_keywords: List[str]) -> Tuple[bool, Optional[str]]:
+        """
+        Finish validating a query that passed the injection checks.
+        
+        Args:
+            sql: SQL query string
+            dangerous_keywords: Dangerous keywords found in the query
+            
+        Returns:
+            Tuple[bool, Optional[str]]: (is_valid, error_message)
+        """
+        # Parse once; also rejects multiple statements
+        structure_error, select_only = SQLValidator._check_structure(sql)
+        if structure_error:
+            return False, structure_error
         
         # Check for dangerous keywords
-        has_dangerous, dangerous_keywords = SQLValidator.contains_dangerous_keywords(sql)
-        if has_dangerous:
+        if dangerous_keywords:
             return False, f"Dangerous SQL keywords detected: {', '.join(dangerous_keywords)}"
         
         # Check if SELECT-only
-        if not SQLValidator.is_select_only(sql):
+        if not select_only:
             return False, "Only SELECT queries are allowed"
         
-        # Try to parse SQL
+        return True, None
+    
+    @staticmethod
+    def _check_structure(sql: str) -> Tuple[Optional[str], bool]:
+        """
+        Parse SQL and check its statement structure.
+        
+        Uses sqloxide when it is installed and falls back to sqlparse.
+        
+        Args:
+            sql: SQL query string
+            
+        Returns:
+            Tuple[Optional[str], bool]: (error_message, is_select_only)
+        """
+        if _sqloxide_parse is not None:
+            try:
+                statements = _sqloxide_parse(sql, dialect="generic")
+            except ValueError as e:
+                return f"SQL parsing error: {str(e)}", False
+            
+            if not statements:
+                return "Unable to parse SQL query", False
+            if len(statements) > 1:
+                return "Multiple SQL statements not allowed", False
+            
+            # SELECT and WITH ... SELECT both parse to a top-level Query node
+            return None, "Query" in statements[0]
+        
         try:
             parsed = sqlparse.parse(sql)
             if not parsed:
-                return False, "Unable to parse SQL query"
+                return "Unable to parse SQL query", False
         except Exception as e:
-            return False, f"SQL parsing error: {str(e)}"
+            return f"SQL parsing error: {str(e)}", False
         
-        return True, None
+        if SQLValidator.has_multiple_statements(parsed):
+            return "Multiple SQL statements not allowed", False
+        
+        return None, SQLValidator.is_select_only(parsed)
     
     @staticmethod
     def sanitize_identifier(identifier: str) -> str:
@@ -210,12 +390,7 @@ class SQLValidator:
         Returns:
             str: Formatted SQL
         """
-        return sqlparse.format(
-            sql,
-            reindent=True,
-            keyword_case='upper',
-            strip_comments=True
-        )
+        return _format_sql(sql)
 
 
 # Global validator instance
@@ -7,9 +7,12 @@ Handles foreign key constraints safely.
 import sys
 import os
 from sqlalchemy import create_engine, text, inspect
+from sqlalchemy.engine import Engine
 from sqlalchemy.exc import SQLAlchemyError
-import argparse
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from graphlib import CycleError, TopologicalSorter
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Set, Tuple
 
 # Add the app directory to the path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -20,15 +23,47 @@ from app.config import settings
 class DatabaseCleaner:
     """Safely clear all data from PostgreSQL database"""
     
-    def __init__(self, database_url: str):
+    # TRUNCATE pays a fixed file unlink/fsync cost per table, so tables
+    # estimated below these sizes are cleared with DELETE instead
+    SMALL_TABLE_ROWS = 1000
+    SMALL_TABLE_BYTES = 64 * 1024  # used when the table was never analyzed
+    
+    # Upper bound on connections used to truncate independent table groups
+    MAX_TRUNCATE_WORKERS = 8
+    
+    def __init__(
+        self,
+        database_url: Optional[str] = None,
+        engine: Optional[Engine] = None,
+        parallel: bool = False,
+        verbose: Optional[bool] = None
+    ):
         """
         Initialize database cleaner.
         
         Args:
-            database_url: PostgreSQL connection URL
+            database_url: PostgreSQL connection URL (ignored if engine is given)
+            engine: Existing engine to reuse instead of opening a new pool
+            parallel: Truncate tables with no foreign keys between them on
+                separate connections. Each group commits on its own, so the
+                cleanup is no longer a single all-or-nothing transaction.
+            verbose: Print progress details (default: only when stdout is a terminal)
         """
-        self.engine = create_engine(database_url)
-        print(f"🔗 Connected to database")
+        if engine is None and not database_url:
+            raise ValueError("Either database_url or engine is required")
+        
+        # Only dispose the pool on close() if this cleaner created it
+        self._owns_engine = engine is None
+        self.engine = engine if engine is not None else create_engine(database_url)
+        self.parallel = parallel
+        self.verbose = sys.stdout.isatty() if verbose is None else verbose
+        # Table and foreign key metadata per schema, resolved once per cleaner
+        # (call invalidate() after schema changes)
+        self._tables_cache: Dict[str, List[str]] = {}
+        self._fk_graph_cache: Dict[str, Dict[str, Set[str]]] = {}
+        self._fk_order_cache: Dict[str, List[str]] = {}
+        if self.verbose:
+            print(f"🔗 Connected to database")
     
     def get_all_tables(self, schema: str = "public") -> List[str]:
         """
@@ -40,11 +75,21 @@ class DatabaseCleaner:
         Returns:
             List of table names
         """
-        inspector = inspect(self.engine)
-        tables = inspector.get_table_names(schema=schema)
-        print(f"📊 Found {len(tables)} tables in schema '{schema}'")
+        if schema not in self._tables_cache:
+            inspector = inspect(self.engine)
+            self._tables_cache[schema] = inspector.get_table_names(schema=schema)
+        
+        tables = list(self._tables_cache[schema])
+        if self.verbose:
+            print(f"📊 Found {len(tables)} tables in schema '{schema}'")
         return tables
     
+    def invalidate(self):
+        """Forget cached table and foreign key metadata (e.g. after migrations)"""
+        self._tables_cache.clear()
+        self._fk_graph_cache.clear()
+        self._fk_order_cache.clear()
+    
     def clear_all_data(self, schema: str = "public", confirm: bool = True):
         """
         Clear all data from all tables.
@@ -59,9 +104,12 @@ class DatabaseCleaner:
             print("⚠️  No tables found in database")
             return
         
-        print("\n📋 Tables that will be cleared:")
-        for i, table in enumerate(tables, 1):
-            print(f"   {i}. {table}")
+        # The list is always shown before asking for confirmation
+        if self.verbose or confirm:
+            # One write for the whole list rather than one per table
+            print("\n📋 Tables that will be cleared:\n" + "\n".join(
+                f"   {i}. {table}" for i, table in enumerate(tables, 1)
+            ))
         
         if confirm:
             print("\n⚠️  WARNING: This will DELETE ALL DATA from these tables!")
@@ -72,64 +120,29 @@ class DatabaseCleaner:
                 print("❌ Operation cancelled")
                 return
         
-        print("\n🧹 Starting data cleanup...\n")
+        if self.verbose:
+            print("\n🧹 Starting data cleanup...\n")
         
         with self.engine.connect() as conn:
             try:
                 # Start transaction
                 trans = conn.begin()
                 
-                # Disable foreign key checks temporarily
-                print("🔓 Disabling foreign key constraints...")
-                conn.execute(text("SET session_replication_role = 'replica';"))
-                
-                # Clear each table
-                cleared_count = 0
-                failed_tables = []
-                
-                for table in tables:
-                    try:
-                        print(f"🗑️  Clearing table: {table}...", end=" ")
-                        
-                        # Use TRUNCATE for better performance
-                        conn.execute(text(f'TRUNCATE TABLE "{schema}"."{table}" CASCADE'))
-                        
-                        # Get count to verify
-                        result = conn.execute(text(f'SELECT COUNT(*) FROM "{schema}"."{table}"'))
-                        count = result.scalar()
-                        
-                        if count == 0:
-                            print("✅ Cleared")
-                            cleared_count += 1
-                        else:
-                            print(f"⚠️  Still has {count} rows")
-                            failed_tables.append(table)
-                            
-                    except Exception as e:
-                        print(f"❌ Failed: {str(e)}")
-                        failed_tables.append(table)
-                
-                # Re-enable foreign key checks
-                print("\n🔒 Re-enabling foreign key constraints...")
-                conn.execute(text("SET session_replication_role = 'origin';"))
+                self._clear_tables(conn, tables, schema)
                 
                 # Commit transaction
                 trans.commit()
                 
                 # Summary
-                print("\n" + "="*60)
-                print("📊 CLEANUP SUMMARY")
-                print("="*60)
-                print(f"✅ Successfully cleared: {cleared_count}/{len(tables)} tables")
-                
-                if failed_tables:
-                    print(f"❌ Failed tables ({len(failed_tables)}):")
-                    for table in failed_tables:
-                        print(f"   - {table}")
-                else:
+                if self.verbose:
+                    print("\n" + "="*60)
+                    print("📊 CLEANUP SUMMARY")
+                    print("="*60)
+                    print(f"✅ Successfully cleared: {len(tables)}/{len(tables)} tables")
                     print("🎉 All tables cleared successfully!")
-                
-                print("="*60)
+                    print("="*60)
+                else:
+                    print(f"✅ Cleared {len(tables)} tables")
                 
             except Exception as e:
                 trans.rollback()
@@ -145,25 +158,15 @@ class DatabaseCleaner:
             table_names: List of table names to clear
             schema: Schema name (default: public)
         """
-        print(f"\n🎯 Clearing {len(table_names)} specific tables...\n")
+        if self.verbose:
+            print(f"\n🎯 Clearing {len(table_names)} specific tables...\n")
         
         with self.engine.connect() as conn:
             try:
                 trans = conn.begin()
                 
-                # Disable foreign key checks
-                conn.execute(text("SET session_replication_role = 'replica';"))
+                self._clear_tables(conn, table_names, schema)
                 
-                for table in table_names:
-                    try:
-                        print(f"🗑️  Clearing table: {table}...", end=" ")
-                        conn.execute(text(f'TRUNCATE TABLE "{schema}"."{table}" CASCADE'))
-                        print("✅ Cleared")
-                    except Exception as e:
-                        print(f"❌ Failed: {str(e)}")
-                
-                # Re-enable foreign key checks
-                conn.execute(text("SET session_replication_role = 'origin';"))
                 trans.commit()
                 
                 print("\n✅ Specific tables cleared successfully!")
@@ -173,14 +176,318 @@ class DatabaseCleaner:
                 print(f"\n❌ Error: {str(e)}")
                 raise
     
+    def _clear_tables(self, conn, tables: List[str], schema: str):
+        """
+        Clear tables inside the caller's transaction.
+        
+        Large tables get one multi-table TRUNCATE; small ones are emptied by
+        a single DELETE statement, which is much cheaper for near-empty tables.
+        Tables referencing a cleared table are cleared too (as CASCADE would),
+        so no CASCADE is needed and no foreign key check can fail.
+        
+        Args:
+            conn: Connection with an open transaction
+            tables: Table names to clear
+            schema: Schema name
+        """
+        # Only this transaction's commit is affected; cleared data needs no fsync
+        conn.execute(text("SET LOCAL synchronous_commit = off"))
+        
+        referenced_by = self._get_referenced_by(schema)
+        cleared = self._with_referencing_tables(tables, referenced_by)
+        if self.verbose and len(cleared) > len(tables):
+            extra = [table for table in cleared if table not in set(tables)]
+            print(f"🔗 Also clearing referencing tables: {', '.join(extra)}")
+        
+        small, large = self._partition_by_size(conn, cleared, schema)
+        
+        # TRUNCATE without CASCADE must include every referencing table
+        large = self._with_referencing_tables(large, referenced_by)
+        large_set = set(large)
+        small = [table for table in small if table not in large_set]
+        
+        # Children before parents
+        position = {table: i for i, table in enumerate(self._get_fk_order(schema))}
+        large.sort(key=lambda table: position.get(table, -1))
+        small.sort(key=lambda table: position.get(table, -1))
+        
+        # Large tables are truncated first: small tables never reference them
+        # (large is closed under referencing tables), but they may be referenced
+        if large and not (self.parallel and self._truncate_parallel(large, referenced_by, schema)):
+            # One statement for all large tables: a single round-trip and a
+            # single catalog pass
+            if self.verbose:
+                print(f"🗑️  Truncating {len(large)} tables...", end=" ")
+            conn.execute(text(
+                f"TRUNCATE TABLE {self._qualified_tables(large, schema)} RESTART IDENTITY"
+            ))
+            if self.verbose:
+                print("✅ Cleared")
+        
+        if small:
+            if self.verbose:
+                print(f"🗑️  Deleting from {len(small)} small tables...", end=" ")
+            conn.execute(text(self._delete_statement(small, schema)))
+            if self.verbose:
+                print("✅ Cleared")
+    
+    def _truncate_parallel(self, tables: List[str], referenced_by: Dict[str, Set[str]], schema: str) -> bool:
+        """
+        Truncate independent groups of tables concurrently.
+        
+        Tables are grouped by foreign-key connectivity; each group is
+        truncated in its own transaction on its own connection, so groups
+        never wait on each other's locks.
+        
+        Args:
+            tables: Table names (closed under referencing tables)
+            referenced_by: Table -> referencing tables map
+            schema: Schema name
+            
+        Returns:
+            bool: True if every group was truncated, False if the caller
+                should truncate sequentially instead
+        """
+        components = self._fk_components(tables, referenced_by)
+        if len(components) < 2:
+            return False
+        
+        workers = min(len(components), self.MAX_TRUNCATE_WORKERS)
+        if self.verbose:
+            print(f"🗑️  Truncating {len(tables)} tables in {len(components)} parallel groups...", end=" ")
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(self._truncate_component, component, schema)
+                for component in components
+            ]
+            errors = [future.exception() for future in futures]
+        
+        errors = [error for error in errors if error is not None]
+        if errors:
+            # Truncation is idempotent, so redoing committed groups is harmless
+            print(f"⚠️  Parallel truncation failed ({errors[0]}), retrying sequentially")
+            return False
+        
+        if self.verbose:
+            print("✅ Cleared")
+        return True
+    
+    def _truncate_component(self, tables: List[str], schema: str):
+        """
+        Truncate one group of tables in its own transaction.
+        
+        Args:
+            tables: Table names
+            schema: Schema name
+        """
+        with self.engine.begin() as conn:
+            conn.execute(text("SET LOCAL synchronous_commit = off"))
+            conn.execute(text(
+                f"TRUNCATE TABLE {self._qualified_tables(tables, schema)} RESTART IDENTITY"
+            ))
+    
+    @staticmethod
+    def _fk_components(tables: List[str], referenced_by: Dict[str, Set[str]]) -> List[List[str]]:
+        """
+        Group tables into weakly connected components of the foreign key graph.
+        
+        Args:
+            tables: Table names
+            referenced_by: Table -> referencing tables map
+            
+        Returns:
+            List of table groups, each keeping the input order
+        """
+        parent = {table: table for table in tables}
+        
+        def find(table: str) -> str:
+            while parent[table] != table:
+                parent[table] = parent[parent[table]]
+                table = parent[table]
+            return table
+        
+        for table in tables:
+            for child in referenced_by.get(table, ()):
+                if child in parent:
+                    parent[find(child)] = find(table)
+        
+        components: Dict[str, List[str]] = {}
+        for table in tables:
+            components.setdefault(find(table), []).append(table)
+        return list(components.values())
+    
+    def _get_referenced_by(self, schema: str) -> Dict[str, Set[str]]:
+        """
+        Map each table to the tables whose foreign keys reference it.
+        
+        Args:
+            schema: Schema name
+            
+        Returns:
+            Dict of table name -> referencing table names (same schema)
+        """
+        if schema not in self._fk_graph_cache:
+            inspector = inspect(self.engine)
+            referenced_by: Dict[str, Set[str]] = {}
+            
+            for (_, table), foreign_keys in inspector.get_multi_foreign_keys(schema=schema).items():
+                for fk in foreign_keys:
+                    if fk.get("referred_schema") in (None, schema):
+                        referenced_by.setdefault(fk["referred_table"], set()).add(table)
+            
+            self._fk_graph_cache[schema] = referenced_by
+        
+        return self._fk_graph_cache[schema]
+    
+    def _get_fk_order(self, schema: str) -> List[str]:
+        """
+        Get tables ordered so referencing tables come before the tables they reference.
+        
+        Args:
+            schema: Schema name
+            
+        Returns:
+            List of table names (children first)
+        """
+        if schema not in self._fk_order_cache:
+            referenced_by = self._get_referenced_by(schema)
+            # Self-references don't constrain the order
+            graph = {
+                table: {child for child in children if child != table}
+                for table, children in referenced_by.items()
+            }
+            try:
+                order = list(TopologicalSorter(graph).static_order())
+            except CycleError:
+                # Circular references: any order works inside one statement
+                order = list(graph)
+            self._fk_order_cache[schema] = order
+        
+        return self._fk_order_cache[schema]
+    
+    @staticmethod
+    def _with_referencing_tables(tables: List[str], referenced_by: Dict[str, Set[str]]) -> List[str]:
+        """
+        Extend tables with every table that (transitively) references one of them.
+        
+        Args:
+            tables: Table names
+            referenced_by: Table -> referencing tables map
+            
+        Returns:
+            Table names, original ones first
+        """
+        result = list(tables)
+        seen = set(tables)
+        for table in result:  # grows while iterating
+            for child in sorted(referenced_by.get(table, ())):
+                if child not in seen:
+                    seen.add(child)
+                    result.append(child)
+        return result
+    
+    def _partition_by_size(self, conn, tables: List[str], schema: str) -> Tuple[List[str], List[str]]:
+        """
+        Split tables into small and large using catalog size estimates.
+        
+        Args:
+            conn: Database connection
+            tables: Table names
+            schema: Schema name
+            
+        Returns:
+            (small_tables, large_tables)
+        """
+        result = conn.execute(
+            text(
+                "SELECT c.relname, c.reltuples, pg_relation_size(c.oid) "
+                "FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace "
+                "WHERE n.nspname = :schema AND c.relkind IN ('r', 'p')"
+            ),
+            {"schema": schema}
+        )
+        sizes = {name: (reltuples, size) for name, reltuples, size in result}
+        
+        small, large = [], []
+        for table in tables:
+            # Unknown tables go through TRUNCATE, which reports errors as before
+            reltuples, size = sizes.get(table, (None, None))
+            if reltuples is None:
+                is_small = False
+            elif reltuples >= 0:
+                is_small = reltuples < self.SMALL_TABLE_ROWS
+            else:  # never analyzed
+                is_small = size < self.SMALL_TABLE_BYTES
+            (small if is_small else large).append(table)
+        
+        return small, large
+    
+    @staticmethod
+    def _delete_statement(tables: List[str], schema: str) -> str:
+        """
+        Build one statement that empties tables and resets their sequences.
+        
+        Each DELETE is a data-modifying CTE, so all tables are cleared in a
+        single round-trip and foreign keys between them are checked only at
+        the end of the statement. Owned sequences are restarted to match
+        TRUNCATE ... RESTART IDENTITY.
+        
+        Args:
+            tables: Table names
+            schema: Schema name
+            
+        Returns:
+            SQL statement
+        """
+        deletes = ", ".join(
+            f'd{i} AS (DELETE FROM "{schema}"."{table}")'
+            for i, table in enumerate(tables)
+        )
+        regclasses = ", ".join(
+            "'" + f'"{schema}"."{table}"'.replace("'", "''") + "'::regclass"
+            for table in tables
+        )
+        return (
+            f"WITH {deletes} "
+            "SELECT setval(seq.seqrelid, seq.seqstart, false) "
+            "FROM pg_sequence seq "
+            "JOIN pg_depend dep ON dep.objid = seq.seqrelid "
+            "AND dep.classid = 'pg_class'::regclass AND dep.deptype IN ('a', 'i') "
+            f"WHERE dep.refobjid IN ({regclasses})"
+        )
+    
+    @staticmethod
+    def _qualified_tables(tables: List[str], schema: str) -> str:
+        """
+        Build a comma-separated list of quoted, schema-qualified table names.
+        
+        Args:
+            tables: Table names
+            schema: Schema name
+            
+        Returns:
+            Table list for a multi-table statement
+        """
+        return ", ".join(f'"{schema}"."{table}"' for table in tables)
+    
     def close(self):
-        """Close database connection"""
-        self.engine.dispose()
-        print("\n🔌 Database connection closed")
+        """Close database connection (shared engines are left open)"""
+        if self._owns_engine:
+            self.engine.dispose()
+        if self.verbose:
+            print("\n🔌 Database connection closed")
 
 
-def main():
-    """Main function"""
+def _build_parser():
+    """
+    Build the full argparse parser (imported lazily: only needed for --help and errors).
+    
+    Returns:
+        argparse.ArgumentParser: Command line parser
+    """
+    import argparse
+    
     parser = argparse.ArgumentParser(
         description="Clear all data from PostgreSQL database tables"
     )
@@ -206,8 +513,69 @@ def main():
         action="store_true",
         help="Skip confirmation prompt"
     )
+    parser.add_argument(
+        "--parallel",
+        action="store_true",
+        help="Truncate unrelated tables concurrently (not a single transaction)"
+    )
+    return parser
+
+
+def _parse_args(argv: List[str]):
+    """
+    Parse command line arguments.
     
-    args = parser.parse_args()
+    The handful of supported options are parsed by hand so the common
+    invocations don't pay for importing and building argparse. --help,
+    abbreviations and anything malformed are handed to argparse, which
+    prints help or the usual error.
+    
+    Args:
+        argv: Arguments without the program name
+        
+    Returns:
+        Namespace with database_url, schema, tables, yes and parallel
+    """
+    values = {
+        "database_url": None,
+        "schema": "public",
+        "tables": None,
+        "yes": False,
+        "parallel": False,
+    }
+    
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        name, has_value, value = arg.partition("=")
+        
+        if arg in ("--yes", "--parallel"):
+            values[arg[2:]] = True
+        elif name in ("--database-url", "--schema"):
+            if not has_value:
+                if i + 1 == len(argv) or argv[i + 1].startswith("-"):
+                    return _build_parser().parse_args(argv)
+                i += 1
+                value = argv[i]
+            values[name[2:].replace("-", "_")] = value
+        elif arg == "--tables":
+            end = i + 1
+            while end < len(argv) and not argv[end].startswith("-"):
+                end += 1
+            if end == i + 1:
+                return _build_parser().parse_args(argv)
+            values["tables"] = argv[i + 1:end]
+            i = end - 1
+        else:
+            return _build_parser().parse_args(argv)
+        i += 1
+    
+    return SimpleNamespace(**values)
+
+
+def main():
+    """Main function"""
+    args = _parse_args(sys.argv[1:])
     
     # Get database URL
     database_url = args.database_url or settings.DATABASE_URL
@@ -217,21 +585,25 @@ def main():
         print("   Use --database-url or set DATABASE_URL in .env")
         sys.exit(1)
     
-    print("\n" + "="*60)
-    print("🧹 DATABASE DATA CLEANUP SCRIPT")
-    print("="*60)
-    print(f"📍 Schema: {args.schema}")
+    # Unattended runs (--yes) only report the outcome
+    verbose = not args.yes
     
-    if args.tables:
-        print(f"🎯 Mode: Clear specific tables ({len(args.tables)} tables)")
-    else:
-        print("🎯 Mode: Clear ALL tables")
-    
-    print("="*60 + "\n")
+    if verbose:
+        print("\n" + "="*60)
+        print("🧹 DATABASE DATA CLEANUP SCRIPT")
+        print("="*60)
+        print(f"📍 Schema: {args.schema}")
+        
+        if args.tables:
+            print(f"🎯 Mode: Clear specific tables ({len(args.tables)} tables)")
+        else:
+            print("🎯 Mode: Clear ALL tables")
+        
+        print("="*60 + "\n")
     
     try:
         # Create cleaner
-        cleaner = DatabaseCleaner(database_url)
+        cleaner = DatabaseCleaner(database_url, parallel=args.parallel, verbose=verbose)
         
         # Clear data
         if args.tables:
@@ -242,7 +614,8 @@ def main():
         # Close connection
         cleaner.close()
         
-        print("\n✅ Script completed successfully!\n")
+        if verbose:
+            print("\n✅ Script completed successfully!\n")
         
     except KeyboardInterrupt:
         print("\n\n⚠️  Operation cancelled by user")
@@ -2,10 +2,12 @@
 Pytest Configuration and Fixtures
 """
 import pytest
+from unittest.mock import AsyncMock, Mock
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from fastapi.testclient import TestClient
 
+from app.agents.state import create_initial_state
 from app.database import Base, get_db
 from app.main import app
 from app.models.user import User
@@ -17,6 +19,9 @@ TEST_DATABASE_URL = "sqlite:///./test.db"
 engine = create_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": False})
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Built once; state_factory copies it instead of rebuilding every field
+_STATE_PROTOTYPE = create_initial_state(user_query="", session_id="", user_id=0)
+
 
 @pytest.fixture(scope="function")
 def db_session():
@@ -70,11 +75,29 @@ def auth_headers(client, test_user):
     return {"Authorization": f"Bearer {token}"}
 
 
+@pytest.fixture
+def state_factory():
+    """Build agent states from a shared prototype, overriding the given fields"""
+    def make(**fields):
+        # Fresh list so tests never share conversation history
+        return {**_STATE_PROTOTYPE, "conversation_history": [], **fields}
+    return make
 
 
-
-
-
-
-
-
+@pytest.fixture
+def mock_claude(monkeypatch):
+    """
+    Replace the supervisor's Claude calls with mocks.
+    
+    Returns (create_message_async, extract_text_content); set the reply text
+    through extract_text_content.return_value.
+    """
+    m_create = AsyncMock(return_value={"content": [], "stop_reason": "end_turn"})
+    m_extract = Mock(return_value="")
+    monkeypatch.setattr(
+        "app.agents.supervisor_agent.claude_service.create_message_async", m_create
+    )
+    monkeypatch.setattr(
+        "app.agents.supervisor_agent.claude_service.extract_text_content", m_extract
+    )
+    return m_create, m_extract
@@ -0,0 +1,185 @@
+"""
+Test Dashboard Agent Tools
+"""
+
+import pytest
+from unittest.mock import patch
+from app.agents.tools import dashboard_tools
+from app.agents.tools.dashboard_tools import (
+    analyze_data_structure,
+    create_dashboard_html,
+    generate_chart_config,
+    _estimate_cardinality,
+    _generate_table_html
+)
+
+
+def test_estimate_cardinality_exact_for_low_cardinality():
+    """Test distinct counts are exact below the sketch threshold"""
+    values = ["North", "South", "East", "West", None] * 100
+
+    assert _estimate_cardinality(values) == 5
+
+
+def test_estimate_cardinality_approximate_for_high_cardinality():
+    """Test distinct counts switch to an estimate for high-cardinality columns"""
+    values = list(range(50000)) * 2
+
+    estimate = _estimate_cardinality(values)
+
+    assert abs(estimate - 50000) / 50000 < 0.05
+
+
+@pytest.mark.asyncio
+async def test_analyze_data_structure_counts_numeric_cardinality():
+    """Test numeric columns report their real distinct count, not a cap"""
+    dashboard_tools._analysis_cache.clear()
+    data = [{"region": "North", "sales": i} for i in range(150)]
+
+    with patch(
+        "app.agents.tools.dashboard_tools.claude_service.create_message_async"
+    ) as mock_claude, patch(
+        "app.agents.tools.dashboard_tools.claude_service.extract_text_content"
+    ) as mock_extract:
+        mock_claude.return_value = {"content": [], "stop_reason": "end_turn"}
+        mock_extract.return_value = '{"dimensions": ["region"], "metrics": ["sales"]}'
+
+        analysis = await analyze_data_structure(data)
+
+    assert analysis["cardinality"] == {"region": 1, "sales": 150}
+
+
+def test_generate_table_html_escapes_values():
+    """Test table cells and headers are HTML-escaped"""
+    data = [{"<b>name</b>": "<script>alert('x')</script>", "notes": "A & B"}]
+
+    html = _generate_table_html(data)
+
+    assert "<script>" not in html
+    assert "&lt;script&gt;alert(&#39;x&#39;)&lt;/script&gt;" in html
+    assert "<th>&lt;b&gt;name&lt;/b&gt;</th>" in html
+    assert "A &amp; B" in html
+
+
+@pytest.mark.asyncio
+async def test_create_dashboard_html_escapes_title_and_chart_data():
+    """Test dashboard title and chart configs cannot inject markup"""
+    config = {"type": "bar", "data": {"labels": ["</script><script>alert(1)</script>"]}}
+
+    html = await create_dashboard_html(
+        data=[{"label": "x"}],
+        chart_configs=[config],
+        title="<img src=x onerror=alert(1)>"
+    )
+
+    assert "<img src=x" not in html
+    assert "&lt;img src=x onerror=alert(1)&gt;" in html
+    assert "</script><script>alert(1)" not in html
+    assert "\\u003c/script\\u003e" in html
+
+
+@pytest.mark.asyncio
+async def test_analyze_data_structure_cached():
+    """Test repeated analysis of the same data is served from cache"""
+    dashboard_tools._analysis_cache.clear()
+    data = [{"region": "North", "sales": 1000}, {"region": "South", "sales": 500}]
+
+    with patch(
+        "app.agents.tools.dashboard_tools.claude_service.create_message_async"
+    ) as mock_claude:
+        mock_claude.return_value = {
+            "content": [{"type": "text", "text": "{}"}],
+            "stop_reason": "end_turn",
+        }
+
+        with patch(
+            "app.agents.tools.dashboard_tools.claude_service.extract_text_content"
+        ) as mock_extract:
+            mock_extract.return_value = '{"dimensions": ["region"], "metrics": ["sales"]}'
+
+            first = await analyze_data_structure(data)
+            second = await analyze_data_structure(list(data))
+
+            assert first == second
+            assert second["cardinality"] == {"region": 2, "sales": 2}
+            mock_claude.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_generate_chart_config_not_served_stale_columns():
+    """Test result sets that share size and first/last rows don't share columns"""
+    analysis = {"dimensions": ["region"], "metrics": ["sales"]}
+    first = [
+        {"region": "North", "sales": 10},
+        {"region": "South", "sales": 20},
+        {"region": "East", "sales": 30},
+    ]
+    second = [dict(row) for row in first]
+    second[1]["sales"] = 999
+
+    first_config = await generate_chart_config(first, "bar", analysis)
+    second_config = await generate_chart_config(second, "bar", analysis)
+
+    assert first_config["data"]["datasets"][0]["data"] == [10.0, 20.0, 30.0]
+    assert second_config["data"]["datasets"][0]["data"] == [10.0, 999.0, 30.0]
+
+
+def test_data_fingerprint_covers_every_row():
+    """Test result sets differing only in a middle row get different fingerprints"""
+    first = [{"region": "North", "sales": 10}, {"region": "South", "sales": 20}, {"region": "East", "sales": 30}]
+    second = [dict(row) for row in first]
+    second[1]["sales"] = 999
+
+    assert dashboard_tools._data_fingerprint(first) == dashboard_tools._data_fingerprint(list(first))
+    assert dashboard_tools._data_fingerprint(first) != dashboard_tools._data_fingerprint(second)
+
+
+@pytest.mark.asyncio
+async def test_analyze_data_structure_uses_own_columns():
+    """Test analysis of a similar-looking result set uses its own values"""
+    dashboard_tools._analysis_cache.clear()
+    first = [{"region": "North"}, {"region": "North"}, {"region": "South"}]
+    second = [{"region": "North"}, {"region": "East"}, {"region": "South"}]
+
+    with patch(
+        "app.agents.tools.dashboard_tools.claude_service.create_message_async"
+    ) as mock_claude, patch(
+        "app.agents.tools.dashboard_tools.claude_service.extract_text_content"
+    ) as mock_extract:
+        mock_claude.return_value = {"content": [], "stop_reason": "end_turn"}
+        mock_extract.return_value = '{"dimensions": ["region"], "metrics": []}'
+
+        assert (await analyze_data_structure(first))["cardinality"] == {"region": 2}
+        assert (await analyze_data_structure(second))["cardinality"] == {"region": 3}
+
+
+@pytest.mark.asyncio
+async def test_generate_chart_config_shares_column_cache():
+    """Test charts built with the same column_cache extract each column once"""
+    analysis = {"dimensions": ["region"], "metrics": ["sales"]}
+    data = [{"region": "North", "sales": 10}, {"region": "South", "sales": 20}]
+    column_cache = {}
+
+    await generate_chart_config(data, "bar", analysis, column_cache)
+    assert column_cache == {"region": ["North", "South"], "sales": [10, 20]}
+
+    # Served from the cache rather than re-read from the rows
+    column_cache["sales"] = [1, 2]
+    config = await generate_chart_config(data, "line", analysis, column_cache)
+    assert config["data"]["datasets"][0]["data"] == [1.0, 2.0]
+
+
+@pytest.mark.asyncio
+async def test_create_dashboard_html_handles_wide_integers():
+    """Test integers wider than 64 bits (e.g. NUMERIC sums) still serialize"""
+    wide = 2 ** 70
+    config = {"type": "bar", "data": {"labels": ["x"], "datasets": [{"data": [wide]}]}}
+
+    html = await create_dashboard_html(
+        data=[{"total": wide}],
+        chart_configs=[config],
+        title="Totals"
+    )
+
+    assert str(wide) in html
+    assert dashboard_tools._data_fingerprint([{"total": wide}])
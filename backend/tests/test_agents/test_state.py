@@ -66,7 +66,7 @@ def test_state_structure():
         "timestamp",
     ]
 
-    for field in required_fields:
-        assert field in state, f"Missing required field: {field}"
+    missing = set(required_fields) - state.keys()
+    assert not missing, f"Missing required fields: {sorted(missing)}"
 
 
@@ -0,0 +1,70 @@
+"""
+Schema Service Tests
+"""
+import pytest
+from types import SimpleNamespace
+from uuid import uuid4
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from app.services.db_service import db_connection_manager
+from app.services.redis_service import redis_service
+from app.services.schema_service import SchemaService, schema_service
+
+
+@pytest.mark.asyncio
+async def test_schema_reload_after_expiry_sees_ddl(monkeypatch):
+    """Test an expired schema is reloaded with fresh reflection"""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    monkeypatch.setattr(
+        db_connection_manager, "get_engine", lambda db_config, read_only=True: engine
+    )
+    db_config = SimpleNamespace(
+        id=uuid4(), database_name="test", db_type="sqlite", schema=None
+    )
+    
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE t1 (a INTEGER)"))
+    
+    try:
+        schema = await schema_service.get_or_load_schema(db_config)
+        assert [table["name"] for table in schema["tables"]] == ["t1"]
+        
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE t2 (x INTEGER)"))
+            conn.execute(text("ALTER TABLE t1 ADD COLUMN b INTEGER"))
+        
+        # Expire the cached schema
+        _, cached = redis_service.schema_cache[db_config.id]
+        redis_service.schema_cache[db_config.id] = (0, cached)
+        
+        schema = await schema_service.get_or_load_schema(db_config)
+        tables = {table["name"]: table for table in schema["tables"]}
+        assert sorted(tables) == ["t1", "t2"]
+        assert [column["name"] for column in tables["t1"]["columns"]] == ["a", "b"]
+    finally:
+        redis_service.invalidate_schema(db_config.id, forget=True)
+        engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_warm_schema_cache_does_not_count_lookups(monkeypatch):
+    """Test background warm-ups leave the cache hit/miss stats untouched"""
+    db_config = SimpleNamespace(id=uuid4())
+    monkeypatch.setattr(
+        SchemaService, "extract_schema", staticmethod(lambda db_config: {"tables": []})
+    )
+    
+    try:
+        await schema_service.warm_schema_cache(db_config)
+        await schema_service.warm_schema_cache(db_config)
+        
+        stats = redis_service.get_schema_cache_stats(db_config.id)
+        assert redis_service.has_cached_schema(db_config.id)
+        assert (stats["hits"], stats["misses"]) == (0, 0)
+    finally:
+        redis_service.invalidate_schema(db_config.id, forget=True)
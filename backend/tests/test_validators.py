@@ -103,3 +103,22 @@ def test_empty_query():
 
 
 
+
+
+def test_validate_many_batched():
+    """Test batch validation matches validating each query on its own"""
+    sqls = [
+        "SELECT * FROM users WHERE id = 1",
+        "DELETE FROM users WHERE id = 1",
+        "SELECT * FROM users;",
+        "SELECT * FROM users; SELECT * FROM orders",
+        "SELECT * FROM users -- comment",
+        "SELECT * FROM users WHERE name = '' OR 1=1",
+        "",
+        "SELECT name FROM users UNION SELECT name FROM customers",
+        "DROP TABLE users",
+        "SELECT 1;\x00DROP TABLE users",
+    ]
+    
+    assert SQLValidator.validate_many(sqls) == [SQLValidator.validate_sql(sql) for sql in sqls]
+    assert SQLValidator.validate_many([]) == []
@@ -3,11 +3,66 @@ Visualize the LangGraph Agent Workflow
 Run this to see the graph structure
 """
 
+import hashlib
+import os
+import shutil
+import subprocess
 import sys
 from app.database import SessionLocal
 from app.agents.graph import create_agent_graph
 
 
+PNG_PATH = "agent_workflow.png"
+
+
+def render_png(graph, mermaid: str, output_path: str = PNG_PATH) -> str:
+    """
+    Render the Mermaid diagram to PNG, skipping unchanged diagrams.
+    
+    Uses a locally installed Mermaid CLI (mmdc) when available and falls
+    back to the mermaid.ink API otherwise. A hash of the Mermaid text is
+    stored next to the PNG so an unchanged graph is never re-rendered.
+    
+    Args:
+        graph: Drawable graph (from compiled_graph.get_graph())
+        mermaid: Mermaid text of the graph
+        output_path: PNG file to write
+        
+    Returns:
+        str: How the PNG was produced ("cached", "mmdc" or "api")
+    """
+    digest = hashlib.blake2b(mermaid.encode(), digest_size=16).hexdigest()
+    hash_path = output_path + ".hash"
+    
+    if os.path.exists(output_path) and os.path.exists(hash_path):
+        with open(hash_path) as f:
+            if f.read().strip() == digest:
+                return "cached"
+    
+    mmdc = shutil.which("mmdc")
+    if mmdc:
+        # Local render: no network round-trip or rate limits
+        subprocess.run(
+            [mmdc, "-i", "-", "-o", output_path],
+            input=mermaid.encode(),
+            check=True,
+            capture_output=True
+        )
+        method = "mmdc"
+    else:
+        from langchain_core.runnables.graph import MermaidDrawMethod
+        
+        png_data = graph.draw_mermaid_png(draw_method=MermaidDrawMethod.API)
+        with open(output_path, "wb") as f:
+            f.write(png_data)
+        method = "api"
+    
+    with open(hash_path, "w") as f:
+        f.write(digest)
+    
+    return method
+
+
 def visualize_graph():
     """Generate and display the agent workflow graph"""
     
@@ -17,6 +72,8 @@ def visualize_graph():
     try:
         print("Creating agent graph...")
         graph = create_agent_graph(db)
+        drawable = graph.get_graph()
+        mermaid = None
         
         print("\n" + "="*60)
         print("AGENT WORKFLOW GRAPH (ASCII)")
@@ -24,7 +81,7 @@ def visualize_graph():
         
         # Draw ASCII representation
         try:
-            ascii_graph = graph.get_graph().draw_ascii()
+            ascii_graph = drawable.draw_ascii()
             print(ascii_graph)
         except Exception as e:
             print(f"ASCII visualization not available: {e}")
@@ -35,32 +92,30 @@ def visualize_graph():
         
         # Draw Mermaid diagram
         try:
-            mermaid = graph.get_graph().draw_mermaid()
+            mermaid = drawable.draw_mermaid()
             print(mermaid)
             print("\n✨ Copy the Mermaid code above to https://mermaid.live to see the visual diagram!")
         except Exception as e:
             print(f"Mermaid visualization error: {e}")
         
-        # Try to save as PNG (requires graphviz)
+        # Try to save as PNG (local mmdc if installed, else mermaid.ink)
         print("\n" + "="*60)
         print("SAVING PNG...")
         print("="*60 + "\n")
         
         try:
-            from langchain_core.runnables.graph import MermaidDrawMethod
-            
-            png_data = graph.get_graph().draw_mermaid_png(
-                draw_method=MermaidDrawMethod.API
-            )
-            
-            with open("agent_workflow.png", "wb") as f:
-                f.write(png_data)
+            if mermaid is None:
+                mermaid = drawable.draw_mermaid()
+            method = render_png(drawable, mermaid)
             
-            print("✅ Graph saved as 'agent_workflow.png'!")
+            if method == "cached":
+                print(f"✅ Graph unchanged, '{PNG_PATH}' is up to date!")
+            else:
+                print(f"✅ Graph saved as '{PNG_PATH}'!")
             print("   Open it to see your agent workflow diagram.")
         except Exception as e:
             print(f"⚠️ PNG generation failed: {e}")
-            print("   Install graphviz if you want PNG output: pip install graphviz")
+            print("   Install the Mermaid CLI for local rendering: npm install -g @mermaid-js/mermaid-cli")
         
     finally:
         db.close()